@@ -20,6 +20,9 @@ CONTEXT_LINES_COUNT: int = 5
 CONTENT_LINES_MAX_COUNT: int = 1000  # Maximum lines to include in file-scope context
 FILE_SCOPE_MAX_LINES: int = 1000  # Maximum lines to include in file-scope context
 
+# Concurrent LLM requests when processing issues, unless the model sets max_concurrency
+DEFAULT_LLM_CONCURRENCY: int = 8
+
 # Paths to configuration files
 MODELS_CONFIG_PATH: str = "models.yaml"
 PROMPTS_DIR_PATH: str = "prompts"
@@ -7,8 +7,16 @@ based on different strategies (e.g., fixed number of lines, function scope).
 
 import os
 import re
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple, List, Set
-from utils.file_utils import is_path_safe, read_file_lines
+from utils.file_utils import is_path_safe
+
+# Maximum number of built contexts a ContextBuilder keeps for reuse
+_CONTEXT_CACHE_SIZE = 1024
+
+# Maximum number of source files a ContextBuilder keeps read into memory
+_LINES_CACHE_SIZE = 16
 
 class ContextBuilder:
     """Class for building code context around issues."""
@@ -22,6 +30,13 @@ class ContextBuilder:
         """
         self.project_root = os.path.abspath(project_root)
         self._file_cache: Dict[str, List[str]] = {}  # Cache for project files
+        # Built contexts keyed by (file_path, file signature, line_number, strategy, options)
+        self._context_cache: "OrderedDict[Tuple, Optional[str]]" = OrderedDict()
+        # Signature and lines of recently read source files, so each file is read once while in use
+        self._lines_cache: "OrderedDict[str, Tuple[Optional[Tuple[int, int]], List[str]]]" = OrderedDict()
+        # A builder may be shared between sessions; the lock guards cache lookups and
+        # stores only, so contexts are built and files read concurrently
+        self._lock = threading.Lock()
         self._std_headers: Set[str] = {
             'iostream', 'vector', 'string', 'map', 'set', 'list', 'deque',
             'queue', 'stack', 'algorithm', 'memory', 'utility', 'tuple',
@@ -45,6 +60,12 @@ class ContextBuilder:
         """
         Build code context around the specified line number using the given strategy.
         
+        Results are cached for the lifetime of the builder, so several issues reported
+        at the same location only read the file once. A cached context is rebuilt when
+        the file's modification time or size changes. Contexts of the "file_with_includes"
+        strategy are not cached, as they also depend on the included headers; its files
+        are still read through the per-file lines cache, which notices edits to each one.
+        
         Args:
             file_path (str): Absolute path to the source file.
             line_number (int): Line number where the issue was found.
@@ -63,18 +84,33 @@ class ContextBuilder:
         if not is_path_safe(file_path, self.project_root):
             return None
         
+        cacheable = strategy != "file_with_includes"
+        cache_key = (file_path, self._file_signature(file_path), line_number, strategy, tuple(sorted(kwargs.items())))
+        if cacheable:
+            with self._lock:
+                if cache_key in self._context_cache:
+                    self._context_cache.move_to_end(cache_key)
+                    return self._context_cache[cache_key]
+        
         print(f"Building context for {file_path}:{line_number} with strategy {strategy}, kwargs: {kwargs}")
         # Select strategy
         if strategy == "fixed_lines":
-            return self._build_fixed_lines_context(file_path, line_number, **kwargs)
+            context = self._build_fixed_lines_context(file_path, line_number, **kwargs)
         elif strategy == "function_scope":
-            return self._build_function_scope_context(file_path, line_number, **kwargs)
+            context = self._build_function_scope_context(file_path, line_number, **kwargs)
         elif strategy == "file_scope":
-            return self._build_file_scope_context(file_path, line_number, **kwargs)
+            context = self._build_file_scope_context(file_path, line_number, **kwargs)
         elif strategy == "file_with_includes":
-            return self._build_file_with_includes_context(file_path, line_number, **kwargs)
+            context = self._build_file_with_includes_context(file_path, line_number, **kwargs)
         else:
             raise ValueError(f"Unsupported context building strategy: {strategy}")
+        
+        if cacheable:
+            with self._lock:
+                self._context_cache[cache_key] = context
+                if len(self._context_cache) > _CONTEXT_CACHE_SIZE:
+                    self._context_cache.popitem(last=False)
+        return context
     
     def _build_fixed_lines_context(
         self,
@@ -99,7 +135,7 @@ class ContextBuilder:
             start_line = max(1, line_number - lines_before)
             end_line = line_number + lines_after
             
-            context = read_file_lines(file_path, start_line, end_line)
+            context = self._read_lines(file_path, start_line, end_line)
             
             # Add line numbers to the context
             lines = context.split('\n')
@@ -143,7 +179,7 @@ class ContextBuilder:
             window_start = max(1, line_number - 50)
             window_end = line_number + 200
             
-            window_content = read_file_lines(file_path, window_start, window_end)
+            window_content = self._read_lines(file_path, window_start, window_end)
             if not window_content:
                 return None
                 
@@ -252,8 +288,7 @@ class ContextBuilder:
         """
         try:
             # Count file lines first to check if it exceeds max_lines
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_line_count = sum(1 for _ in f)
+            file_line_count = len(self._get_file_lines(file_path))
                 
             if file_line_count > max_lines:
                 # If file is too large, fallback to function scope or fixed lines
@@ -263,7 +298,7 @@ class ContextBuilder:
                 return self._build_fixed_lines_context(file_path, line_number, **kwargs)
                 
             # Read the entire file
-            context = read_file_lines(file_path, 1, file_line_count)
+            context = self._read_lines(file_path, 1, file_line_count)
             if not context:
                 return None
                 
@@ -318,7 +353,7 @@ class ContextBuilder:
                 self._build_file_cache()
             
             # Read the main file
-            main_file_content = read_file_lines(file_path, 1, float('inf'))
+            main_file_content = self._read_lines(file_path, 1, float('inf'))
             if not main_file_content:
                 print(f"Failed to read main file: {file_path}")
                 return None
@@ -334,7 +369,7 @@ class ContextBuilder:
             for include in includes:
                 include_path = self._find_include_file(include)
                 if include_path:
-                    include_content = read_file_lines(include_path, 1, float('inf'))
+                    include_content = self._read_lines(include_path, 1, float('inf'))
                     if include_content:
                         included_files_context.append(f"\nIncluded File: {include_path}\n{include_content}")
             
@@ -344,17 +379,93 @@ class ContextBuilder:
             print(f"Error building file with includes context: {str(e)}")
             return None
     
+    @staticmethod
+    def _file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the (mtime, size) of a file, used to detect changes to cached files.
+        
+        Args:
+            file_path (str): Path to the file.
+            
+        Returns:
+            Optional[Tuple[int, int]]: Modification time in nanoseconds and size in bytes,
+            or None if the file cannot be accessed.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _get_file_lines(self, file_path: str) -> List[str]:
+        """
+        Get the lines of a file, reading it only if it is not cached or has changed.
+        
+        Args:
+            file_path (str): Path to the file to read.
+            
+        Returns:
+            List[str]: The lines of the file, including line endings.
+            
+        Raises:
+            OSError: If the file cannot be read.
+            UnicodeDecodeError: If the file is not valid UTF-8.
+        """
+        signature = self._file_signature(file_path)
+        with self._lock:
+            cached = self._lines_cache.get(file_path)
+            if cached is not None and cached[0] == signature:
+                self._lines_cache.move_to_end(file_path)
+                return cached[1]
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        with self._lock:
+            self._lines_cache[file_path] = (signature, lines)
+            self._lines_cache.move_to_end(file_path)
+            if len(self._lines_cache) > _LINES_CACHE_SIZE:
+                self._lines_cache.popitem(last=False)
+        return lines
+    
+    def _read_lines(self, file_path: str, start_line: int, end_line: int) -> Optional[str]:
+        """
+        Read specific lines from a file, like utils.file_utils.read_file_lines but
+        served from the builder's file cache.
+        
+        Args:
+            file_path (str): Path to the file to read.
+            start_line (int): First line to read (1-based).
+            end_line (int): Last line to read (inclusive).
+            
+        Returns:
+            Optional[str]: The content of the specified lines, or None if an error occurs.
+        """
+        try:
+            start_line = max(1, start_line)
+            end_line = max(start_line, end_line)
+            
+            lines = self._get_file_lines(file_path)
+            end_line = min(end_line, len(lines))
+            return ''.join(lines[start_line - 1:end_line]).rstrip('\n')
+            
+        except Exception as e:
+            print(f"Error reading file lines: {str(e)}")
+            return None
+    
     def _build_file_cache(self) -> None:
         """
         Build a cache of all files in the project directory.
         This helps avoid repeated directory traversals.
         """
+        # Filled in locally and then swapped in, so a concurrent build never sees a partial index
+        file_cache: Dict[str, List[str]] = {}
         for root, _, files in os.walk(self.project_root):
             for file in files:
                 if file.endswith(('.h', '.hpp', '.cpp', '.cc', '.c')):
                     full_path = os.path.join(root, file)
                     rel_path = os.path.relpath(full_path, self.project_root)
-                    self._file_cache[rel_path] = [root, file]
+                    file_cache[rel_path] = [root, file]
+        self._file_cache = file_cache
     
     def _find_includes(self, content: str) -> List[str]:
         """
@@ -15,11 +15,12 @@ DB_INITIALIZED:bool = False
 
 import os
 import sqlite3
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable
 from datetime import datetime
 import json
 import logging
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 # Set up logging
@@ -81,6 +82,34 @@ CREATE TABLE IF NOT EXISTS llm_responses (
 )
 """
 
+# Classifications are looked up by issue, and the contradictory-issue filter groups
+# them by issue and counts distinct values; this index covers both without reading rows
+CREATE_LLM_CLASSIFICATIONS_ISSUE_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_llm_classifications_issue
+ON llm_classifications (issue_id, classification)
+"""
+
+# SQL statements for recording LLM results
+INSERT_LLM_CLASSIFICATION = """
+INSERT INTO llm_classifications (
+    issue_id, llm_model_name, context_strategy, prompt_template,
+    source_code_context, classification, explanation
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_LLM_RESPONSE = """
+INSERT INTO llm_responses (
+    classification_id, full_prompt, full_response, 
+    prompt_tokens, completion_tokens, total_tokens,
+    response_time_ms, model_parameters
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Fields every issue passed to add_issues must provide
+_REQUIRED_ISSUE_FIELDS = frozenset((
+    'cppcheck_file', 'cppcheck_line', 'cppcheck_severity', 'cppcheck_id', 'cppcheck_summary'
+))
+
 # Trigger to update the 'updated_at' field in issues table
 CREATE_UPDATE_TRIGGER = """
 CREATE TRIGGER IF NOT EXISTS update_issues_timestamp
@@ -116,6 +145,35 @@ def get_db_connection() -> sqlite3.Connection:
         if conn:
             conn.close()
 
+@lru_cache(maxsize=64)
+def _column_names(description: Tuple[Tuple[Any, ...], ...]) -> Tuple[str, ...]:
+    """
+    Extract the column names from a cursor description.
+    
+    Args:
+        description: The cursor.description of the statement being read.
+        
+    Returns:
+        Tuple[str, ...]: Column names in result order.
+    """
+    return tuple(column[0] for column in description)
+
+def _dict_row_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    Row factory that builds plain dictionaries directly from fetched rows.
+    
+    Set it on the cursor of queries whose rows are returned to callers as
+    dictionaries, instead of converting sqlite3.Row objects afterwards.
+    
+    Args:
+        cursor: The cursor the row was fetched from.
+        row: The raw row values.
+        
+    Returns:
+        Dict[str, Any]: The row keyed by column name.
+    """
+    return dict(zip(_column_names(cursor.description), row))
+
 def init_db() -> None:
     """
     Initialize the database by creating necessary tables if they don't exist.
@@ -132,6 +190,7 @@ def init_db() -> None:
             cursor.execute(CREATE_ISSUES_TABLE)
             cursor.execute(CREATE_LLM_CLASSIFICATIONS_TABLE)
             cursor.execute(CREATE_LLM_RESPONSES_TABLE)
+            cursor.execute(CREATE_LLM_CLASSIFICATIONS_ISSUE_INDEX)
             cursor.execute(CREATE_UPDATE_TRIGGER)
             conn.commit()
             logger.info("Database initialized successfully.")
@@ -140,13 +199,17 @@ def init_db() -> None:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
-def add_issues(issues: List[Dict[str, Any]]) -> List[int]:
+def add_issues(issues: List[Dict[str, Any]], conn: Optional[sqlite3.Connection] = None) -> List[int]:
     """
     Add new issues parsed from cppcheck CSV to the database.
     
     Args:
         issues (List[Dict[str, Any]]): List of dictionaries representing cppcheck issues.
-            Each dictionary should have keys: 'file', 'line', 'severity', 'id', 'summary'.
+            Each dictionary should have keys: 'cppcheck_file', 'cppcheck_line',
+            'cppcheck_severity', 'cppcheck_id', 'cppcheck_summary'.
+        conn (Optional[sqlite3.Connection]): Connection from get_db_connection to insert
+            on. The caller then commits, so several calls can form one transaction.
+            If None, a new connection is opened and the issues are committed.
             
     Returns:
         List[int]: List of issue IDs that were added to the database.
@@ -155,39 +218,62 @@ def add_issues(issues: List[Dict[str, Any]]) -> List[int]:
         sqlite3.Error: If a database error occurs.
         ValueError: If any issue is missing required fields.
     """
-    issue_ids = []
-    required_fields = ['cppcheck_file', 'cppcheck_line', 'cppcheck_severity', 'cppcheck_id', 'cppcheck_summary']
+    # Validate every issue has all required fields before inserting any of them
+    for issue in issues:
+        missing = _REQUIRED_ISSUE_FIELDS - issue.keys()
+        if missing:
+            raise ValueError(f"Issue missing required fields: {sorted(missing)}")
+    
+    if not issues:
+        return []
     
     try:
+        if conn is not None:
+            return _insert_issues(conn, issues)
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            for issue in issues:
-                # Validate issue has all required fields
-                if not all(field in issue for field in required_fields):
-                    missing = [f for f in required_fields if f not in issue]
-                    raise ValueError(f"Issue missing required fields: {missing}")
-                
-                cursor.execute("""
-                    INSERT INTO issues (
-                        cppcheck_file, cppcheck_line, cppcheck_severity, 
-                        cppcheck_id, cppcheck_summary, status
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    issue['cppcheck_file'], 
-                    issue['cppcheck_line'], 
-                    issue['cppcheck_severity'], 
-                    issue['cppcheck_id'], 
-                    issue['cppcheck_summary'],
-                    'pending_llm'
-                ))
-                issue_ids.append(cursor.lastrowid)
+            issue_ids = _insert_issues(conn, issues)
             conn.commit()
-            logger.info(f"Added {len(issue_ids)} issues to the database.")
             return issue_ids
     except sqlite3.Error as e:
         logger.error(f"Failed to add issues: {e}")
         raise
 
+def _insert_issues(conn: sqlite3.Connection, issues: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert validated issues without committing.
+    
+    Args:
+        conn (sqlite3.Connection): Connection to insert on.
+        issues (List[Dict[str, Any]]): Non-empty list of issues with all required fields.
+        
+    Returns:
+        List[int]: IDs of the inserted issues.
+    """
+    cursor = conn.cursor()
+    cursor.executemany("""
+        INSERT INTO issues (
+            cppcheck_file, cppcheck_line, cppcheck_severity, 
+            cppcheck_id, cppcheck_summary, status
+        ) VALUES (?, ?, ?, ?, ?, 'pending_llm')
+    """, [
+        (
+            issue['cppcheck_file'], 
+            issue['cppcheck_line'], 
+            issue['cppcheck_severity'], 
+            issue['cppcheck_id'], 
+            issue['cppcheck_summary']
+        )
+        for issue in issues
+    ])
+    
+    # AUTOINCREMENT IDs of rows inserted in one transaction are consecutive
+    cursor.execute("SELECT last_insert_rowid()")
+    last_id = cursor.fetchone()[0]
+    issue_ids = list(range(last_id - len(issues) + 1, last_id + 1))
+    
+    logger.info(f"Added {len(issue_ids)} issues to the database.")
+    return issue_ids
+
 def get_issue_by_id(issue_id: int) -> Optional[Dict[str, Any]]:
     """
     Retrieve a specific issue with all its LLM classifications.
@@ -204,52 +290,43 @@ def get_issue_by_id(issue_id: int) -> Optional[Dict[str, Any]]:
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row_factory
             
             # Get issue
             cursor.execute("""
                 SELECT * FROM issues WHERE id = ?
             """, (issue_id,))
-            issue = cursor.fetchone()
+            issue_dict = cursor.fetchone()
             
-            if not issue:
+            if not issue_dict:
                 return None
             
-            # Convert to dict
-            issue_dict = dict(issue)
-            
             # Get classifications
             cursor.execute("""
                 SELECT * FROM llm_classifications WHERE issue_id = ?
                 ORDER BY processing_timestamp DESC
             """, (issue_id,))
-            classifications = [dict(row) for row in cursor.fetchall()]
-            
-            issue_dict['llm_classifications'] = classifications
+            issue_dict['llm_classifications'] = cursor.fetchall()
             return issue_dict
     except sqlite3.Error as e:
         logger.error(f"Failed to get issue {issue_id}: {e}")
         raise
 
-def get_all_issues(filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
+def _build_issue_conditions(filters: Optional[Dict]) -> Tuple[List[str], List[Any]]:
     """
-    Retrieve all issues, optionally applying filters.
+    Build SQL WHERE conditions for the simple issue filters.
     
     Args:
-        filters (Optional[Dict]): Dictionary of filter conditions. 
+        filters (Optional[Dict]): Dictionary of filter conditions.
             Supported filters: 'status', 'severity', 'true_classification'.
             
     Returns:
-        List[Dict[str, Any]]: List of issue dictionaries.
-        
-    Raises:
-        sqlite3.Error: If a database error occurs.
+        Tuple[List[str], List[Any]]: The conditions and their bound parameters.
     """
-    query = "SELECT * FROM issues"
+    conditions = []
     params = []
     
     if filters:
-        conditions = []
-        
         if 'status' in filters:
             conditions.append("status = ?")
             params.append(filters['status'])
@@ -261,29 +338,200 @@ def get_all_issues(filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
         if 'true_classification' in filters:
             conditions.append("true_classification = ?")
             params.append(filters['true_classification'])
+    
+    return conditions, params
+
+def _attach_classifications(
+    cursor: sqlite3.Cursor,
+    issues: List[Dict[str, Any]],
+    issue_ids_query: str,
+    params: List[Any]
+) -> None:
+    """
+    Attach the LLM classifications of each issue, newest first, with one query.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor using _dict_row_factory.
+        issues (List[Dict[str, Any]]): Issues to attach 'llm_classifications' to.
+        issue_ids_query (str): SELECT returning the IDs of the issues, used as a
+            subquery so the number of issues is not limited by SQL variables.
+        params (List[Any]): Parameters bound to issue_ids_query.
+    """
+    issues_by_id = {}
+    for issue in issues:
+        issue['llm_classifications'] = []
+        issues_by_id[issue['id']] = issue
+    
+    if not issues_by_id:
+        return
+    
+    cursor.execute(f"""
+        SELECT * FROM llm_classifications WHERE issue_id IN ({issue_ids_query})
+        ORDER BY processing_timestamp DESC
+    """, params)
+    for row in cursor.fetchall():
+        issue = issues_by_id.get(row['issue_id'])
+        if issue is not None:
+            issue['llm_classifications'].append(row)
+
+def get_all_issues(filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
+    """
+    Retrieve all issues, optionally applying filters.
+    
+    Args:
+        filters (Optional[Dict]): Dictionary of filter conditions. 
+            Supported filters: 'status', 'severity', 'true_classification'.
+            
+    Returns:
+        List[Dict[str, Any]]: List of issue dictionaries.
+        
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    conditions, params = _build_issue_conditions(filters)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _dict_row_factory
+            cursor.execute(f"SELECT * FROM issues{where} ORDER BY id DESC", params)
+            issues = cursor.fetchall()
+            
+            # Get classifications for all issues in one query
+            _attach_classifications(cursor, issues, f"SELECT id FROM issues{where}", params)
+                
+            return issues
+    except sqlite3.Error as e:
+        logger.error(f"Failed to get issues: {e}")
+        raise
+
+def get_issues_page(
+    filters: Optional[Dict] = None,
+    limit: int = 100,
+    before_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Retrieve one page of issues using keyset pagination, newest first.
+    
+    Args:
+        filters (Optional[Dict]): Dictionary of filter conditions.
+            Supported filters: 'status', 'severity', 'true_classification'.
+        limit (int): Maximum number of issues to return.
+        before_id (Optional[int]): Only return issues with an ID lower than this one.
+            Pass the previous page's 'next_before_id' to continue.
+            
+    Returns:
+        Dict[str, Any]: Dictionary with:
+            - 'items': List of issue dictionaries with their LLM classifications
+            - 'next_before_id': ID to pass as before_id for the next page, or None if
+              this page is empty
         
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    query = "SELECT * FROM issues"
+    conditions, params = _build_issue_conditions(filters)
     
-    query += " ORDER BY id DESC"
+    if before_id is not None:
+        conditions.append("id < ?")
+        params.append(before_id)
+    
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
     
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row_factory
             cursor.execute(query, params)
-            issues = [dict(row) for row in cursor.fetchall()]
+            issues = cursor.fetchall()
             
-            # Get classifications for each issue
+            # Get classifications for the whole page in one query
+            issues_by_id = {}
             for issue in issues:
-                cursor.execute("""
-                    SELECT * FROM llm_classifications WHERE issue_id = ?
+                issue['llm_classifications'] = []
+                issues_by_id[issue['id']] = issue
+            
+            if issues_by_id:
+                placeholders = ", ".join("?" for _ in issues_by_id)
+                cursor.execute(f"""
+                    SELECT * FROM llm_classifications WHERE issue_id IN ({placeholders})
                     ORDER BY processing_timestamp DESC
-                """, (issue['id'],))
-                issue['llm_classifications'] = [dict(row) for row in cursor.fetchall()]
-                
-            return issues
+                """, list(issues_by_id))
+                for row in cursor.fetchall():
+                    issues_by_id[row['issue_id']]['llm_classifications'].append(row)
+            
+            return {
+                'items': issues,
+                'next_before_id': issues[-1]['id'] if issues else None
+            }
     except sqlite3.Error as e:
-        logger.error(f"Failed to get issues: {e}")
+        logger.error(f"Failed to get issues page: {e}")
+        raise
+
+def get_issues_filtered(
+    statuses: Optional[Iterable[str]] = None,
+    severities: Optional[Iterable[str]] = None,
+    limit: Optional[int] = 1000,
+    before_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve the newest issues matching any of the given statuses and severities.
+    
+    Unlike get_all_issues, only the issue rows are read; LLM classifications are
+    not attached.
+    
+    Args:
+        statuses (Optional[Iterable[str]]): Status values to match. Empty or None
+            matches every status.
+        severities (Optional[Iterable[str]]): Severity values to match. Empty or None
+            matches every severity.
+        limit (Optional[int]): Maximum number of issues to return, or None for all
+            matching issues.
+        before_id (Optional[int]): Only return issues with an ID lower than this one.
+            Pass the last ID of the previous page to continue.
+    
+    Returns:
+        List[Dict[str, Any]]: List of issue dictionaries, newest first.
+    
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    query = "SELECT * FROM issues"
+    conditions = []
+    params = []
+    
+    for column, values in (("status", statuses), ("cppcheck_severity", severities)):
+        values = list(values or ())
+        if values:
+            placeholders = ", ".join("?" for _ in values)
+            conditions.append(f"{column} IN ({placeholders})")
+            params.extend(values)
+    
+    if before_id is not None:
+        conditions.append("id < ?")
+        params.append(before_id)
+    
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    
+    query += " ORDER BY id DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _dict_row_factory
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to get filtered issues: {e}")
         raise
 
 def get_issue_count() -> int:
@@ -443,58 +691,95 @@ def add_llm_classification(
         sqlite3.Error: If a database error occurs.
         ValueError: If issue_id does not exist.
     """
+    return add_llm_classifications_bulk([{
+        'issue_id': issue_id,
+        'llm_model_name': llm_model_name,
+        'context_strategy': context_strategy,
+        'prompt_template': prompt_template,
+        'source_code_context': source_code_context,
+        'classification': classification,
+        'explanation': explanation,
+        'full_prompt': full_prompt,
+        'full_response': full_response,
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': total_tokens,
+        'response_time_ms': response_time_ms,
+        'model_parameters': model_parameters
+    }])[0]
+
+def add_llm_classifications_bulk(entries: List[Dict[str, Any]]) -> List[Union[int, Tuple[int, int]]]:
+    """
+    Add several LLM classification attempts to the database in one transaction.
+    
+    Args:
+        entries (List[Dict[str, Any]]): One dictionary per classification, using the same
+            keys as the parameters of add_llm_classification. 'issue_id', 'llm_model_name',
+            'context_strategy', 'prompt_template', 'source_code_context' and 'classification'
+            are required; the remaining keys are optional.
+        
+    Returns:
+        List[Union[int, Tuple[int, int]]]: One result per entry, in order. Each is a tuple of
+            (classification_id, response_id) if the entry has full_prompt and full_response,
+            otherwise just the classification_id.
+        
+    Raises:
+        sqlite3.Error: If a database error occurs.
+        ValueError: If any issue_id does not exist.
+    """
+    if not entries:
+        return []
+    
+    issue_ids = {entry['issue_id'] for entry in entries}
+    placeholders = ", ".join("?" for _ in issue_ids)
+    
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            # Check if issue exists
-            cursor.execute("SELECT id FROM issues WHERE id = ?", (issue_id,))
-            if not cursor.fetchone():
-                raise ValueError(f"Issue with ID {issue_id} does not exist")
-            
-            # Insert classification
-            cursor.execute("""
-                INSERT INTO llm_classifications (
-                    issue_id, llm_model_name, context_strategy, prompt_template,
-                    source_code_context, classification, explanation
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                issue_id, llm_model_name, context_strategy, prompt_template,
-                source_code_context, classification, explanation
-            ))
+            # Check that all issues exist
+            cursor.execute(f"SELECT id FROM issues WHERE id IN ({placeholders})", tuple(issue_ids))
+            missing = issue_ids - {row['id'] for row in cursor.fetchall()}
+            if missing:
+                raise ValueError(f"Issue with ID {min(missing)} does not exist")
             
-            classification_id = cursor.lastrowid
+            results = []
+            for entry in entries:
+                # Insert classification
+                cursor.execute(INSERT_LLM_CLASSIFICATION, (
+                    entry['issue_id'], entry['llm_model_name'], entry['context_strategy'],
+                    entry['prompt_template'], entry['source_code_context'],
+                    entry['classification'], entry.get('explanation')
+                ))
+                classification_id = cursor.lastrowid
+                
+                # If full prompt and response are provided, add a record to llm_responses
+                if entry.get('full_prompt') and entry.get('full_response'):
+                    cursor.execute(INSERT_LLM_RESPONSE, (
+                        classification_id,
+                        entry['full_prompt'],
+                        entry['full_response'],
+                        entry.get('prompt_tokens'),
+                        entry.get('completion_tokens'),
+                        entry.get('total_tokens'),
+                        entry.get('response_time_ms'),
+                        _serialize_model_parameters(entry.get('model_parameters'))
+                    ))
+                    results.append((classification_id, cursor.lastrowid))
+                else:
+                    results.append(classification_id)
             
-            # Update issue status if this is the first classification
-            cursor.execute("""
+            # Move issues classified for the first time to review
+            cursor.execute(f"""
                 UPDATE issues SET status = 'pending_review'
-                WHERE id = ? AND status = 'pending_llm'
-            """, (issue_id,))
+                WHERE status = 'pending_llm' AND id IN ({placeholders})
+            """, tuple(issue_ids))
             
             conn.commit()
-            
-            # If full prompt and response are provided, add a record to llm_responses
-            response_id = None
-            if full_prompt and full_response:
-                try:
-                    response_id = add_llm_response(
-                        classification_id=classification_id,
-                        full_prompt=full_prompt,
-                        full_response=full_response,
-                        prompt_tokens=prompt_tokens,
-                        completion_tokens=completion_tokens,
-                        total_tokens=total_tokens,
-                        response_time_ms=response_time_ms,
-                        model_parameters=model_parameters
-                    )
-                    return (classification_id, response_id)
-                except Exception as e:
-                    logger.error(f"Failed to add LLM response for classification {classification_id}: {e}")
-                    # Still return the classification_id even if adding the response fails
-            
-            return classification_id
+            logger.info(f"Added {len(results)} LLM classifications to the database.")
+            return results
     except sqlite3.Error as e:
-        logger.error(f"Failed to add classification: {e}")
+        logger.error(f"Failed to add classifications: {e}")
         raise
 
 def update_llm_classification_review(
@@ -520,17 +805,15 @@ def update_llm_classification_review(
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            # Check if classification exists
-            cursor.execute("SELECT id FROM llm_classifications WHERE id = ?", (classification_id,))
-            if not cursor.fetchone():
-                return False
-            
+            # A missing classification updates no rows, so no existence check is needed
             cursor.execute("""
                 UPDATE llm_classifications SET
                     user_agrees = ?,
                     user_comment = ?
                 WHERE id = ?
             """, (user_agrees, user_comment, classification_id))
+            if cursor.rowcount == 0:
+                return False
             
             conn.commit()
             return True
@@ -567,11 +850,6 @@ def set_issue_true_classification(
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            # Check if issue exists
-            cursor.execute("SELECT id FROM issues WHERE id = ?", (issue_id,))
-            if not cursor.fetchone():
-                return False
-            
             cursor.execute("""
                 UPDATE issues SET
                     true_classification = ?,
@@ -579,6 +857,8 @@ def set_issue_true_classification(
                     status = 'reviewed'
                 WHERE id = ?
             """, (classification, comment, issue_id))
+            if cursor.rowcount == 0:
+                return False
             
             conn.commit()
             return True
@@ -606,12 +886,6 @@ def get_llm_statistics(filters: Optional[Dict] = None) -> Dict[str, Any]:
             cursor = conn.cursor()
             
             # Base query parts
-            select_base = """
-                SELECT lc.llm_model_name, lc.context_strategy, lc.prompt_template,
-                       lc.classification, i.true_classification, 
-                       CASE WHEN lc.classification = i.true_classification THEN 1 ELSE 0 END as is_correct
-            """
-            
             from_base = """
                 FROM llm_classifications lc
                 JOIN issues i ON lc.issue_id = i.id
@@ -646,71 +920,44 @@ def get_llm_statistics(filters: Optional[Dict] = None) -> Dict[str, Any]:
                 if conditions:
                     from_base += " AND " + " AND ".join(conditions)
             
-            # Overall accuracy
+            # Overall, per-model, per-strategy and per-template accuracy in a single
+            # statement over the joined rows
             cursor.execute(f"""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN lc.classification = i.true_classification THEN 1 ELSE 0 END) as correct
-                {from_base}
-            """, params)
-            
-            overall = cursor.fetchone()
-            total = overall['total'] if overall else 0
-            correct = overall['correct'] if overall else 0
-            
-            # LLM model performance
-            cursor.execute(f"""
-                {select_base}
-                {from_base}
-                GROUP BY lc.llm_model_name
+                WITH joined AS (
+                    SELECT lc.llm_model_name, lc.context_strategy, lc.prompt_template,
+                           CASE WHEN lc.classification = i.true_classification THEN 1 ELSE 0 END as is_correct
+                    {from_base}
+                )
+                SELECT 'overall' as kind, NULL as key, COUNT(*) as total, SUM(is_correct) as correct
+                FROM joined
+                UNION ALL
+                SELECT 'model', llm_model_name, COUNT(*), SUM(is_correct)
+                FROM joined GROUP BY llm_model_name
+                UNION ALL
+                SELECT 'strategy', context_strategy, COUNT(*), SUM(is_correct)
+                FROM joined GROUP BY context_strategy
+                UNION ALL
+                SELECT 'template', prompt_template, COUNT(*), SUM(is_correct)
+                FROM joined GROUP BY prompt_template
             """, params)
             
+            total, correct = 0, 0
             llm_models = {}
-            for row in cursor.fetchall():
-                model_name = row['llm_model_name']
-                if model_name not in llm_models:
-                    llm_models[model_name] = {
-                        'total': 0,
-                        'correct': 0
-                    }
-                llm_models[model_name]['total'] += 1
-                llm_models[model_name]['correct'] += row['is_correct']
-            
-            # Context strategy performance
-            cursor.execute(f"""
-                {select_base}
-                {from_base}
-                GROUP BY lc.context_strategy
-            """, params)
-            
             context_strategies = {}
-            for row in cursor.fetchall():
-                strategy = row['context_strategy']
-                if strategy not in context_strategies:
-                    context_strategies[strategy] = {
-                        'total': 0,
-                        'correct': 0
-                    }
-                context_strategies[strategy]['total'] += 1
-                context_strategies[strategy]['correct'] += row['is_correct']
-            
-            # Prompt template performance
-            cursor.execute(f"""
-                {select_base}
-                {from_base}
-                GROUP BY lc.prompt_template
-            """, params)
-            
             prompt_templates = {}
-            for row in cursor.fetchall():
-                template = row['prompt_template']
-                if template not in prompt_templates:
-                    prompt_templates[template] = {
-                        'total': 0,
-                        'correct': 0
+            groups = {
+                'model': llm_models,
+                'strategy': context_strategies,
+                'template': prompt_templates
+            }
+            for kind, key, group_total, group_correct in cursor.fetchall():
+                if kind == 'overall':
+                    total, correct = group_total, group_correct
+                else:
+                    groups[kind][key] = {
+                        'total': group_total,
+                        'correct': group_correct
                     }
-                prompt_templates[template]['total'] += 1
-                prompt_templates[template]['correct'] += row['is_correct']
             
             # Classification distribution
             cursor.execute("""
@@ -722,9 +969,7 @@ def get_llm_statistics(filters: Optional[Dict] = None) -> Dict[str, Any]:
                 GROUP BY true_classification
             """)
             
-            classification_dist = {}
-            for row in cursor.fetchall():
-                classification_dist[row['true_classification']] = row['count']
+            classification_dist = dict(cursor.fetchall())
             
             return {
                 'overall_accuracy': {
@@ -761,6 +1006,25 @@ def get_llm_statistics(filters: Optional[Dict] = None) -> Dict[str, Any]:
         traceback.print_exc()
         raise
 
+def _serialize_model_parameters(model_parameters: Optional[Dict]) -> Optional[str]:
+    """
+    Convert a model parameters dictionary to a JSON string for storage.
+    
+    Args:
+        model_parameters (Optional[Dict]): Dictionary of model parameters used (temperature, etc.).
+        
+    Returns:
+        Optional[str]: JSON string, or None if no parameters were given or they can't be serialized.
+    """
+    if not model_parameters:
+        return None
+    try:
+        return json.dumps(model_parameters)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Failed to serialize model parameters: {e}")
+        # Still continue with the rest of the data
+        return None
+
 def add_llm_response(
     classification_id: int, 
     full_prompt: str, 
@@ -791,14 +1055,7 @@ def add_llm_response(
         sqlite3.Error: If a database error occurs.
         ValueError: If the classification_id is invalid.
     """
-    # Convert model_parameters dict to JSON string if provided
-    model_parameters_json = None
-    if model_parameters:
-        try:
-            model_parameters_json = json.dumps(model_parameters)
-        except (TypeError, ValueError) as e:
-            logger.warning(f"Failed to serialize model parameters: {e}")
-            # Still continue with the rest of the data
+    model_parameters_json = _serialize_model_parameters(model_parameters)
     
     try:
         with get_db_connection() as conn:
@@ -809,13 +1066,7 @@ def add_llm_response(
             if not cursor.fetchone():
                 raise ValueError(f"Invalid classification_id: {classification_id}")
             
-            cursor.execute("""
-                INSERT INTO llm_responses (
-                    classification_id, full_prompt, full_response, 
-                    prompt_tokens, completion_tokens, total_tokens,
-                    response_time_ms, model_parameters
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(INSERT_LLM_RESPONSE, (
                 classification_id,
                 full_prompt,
                 full_response,
@@ -913,9 +1164,9 @@ def get_llm_responses(filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _dict_row_factory
             cursor.execute(query, params)
-            responses = [dict(row) for row in cursor.fetchall()]
-            return responses
+            return cursor.fetchall()
     except sqlite3.Error as e:
         logger.error(f"Failed to get LLM responses: {e}")
         raise
@@ -1029,8 +1280,9 @@ def get_token_usage_statistics(filters: Optional[Dict] = None) -> Dict[str, Any]
             
             query += " GROUP BY c.prompt_template"
             
+            cursor.row_factory = _dict_row_factory
             cursor.execute(query, params)
-            prompt_template_usage = [dict(row) for row in cursor.fetchall()]
+            prompt_template_usage = cursor.fetchall()
         
         return {
             'total_interactions': len(responses),
@@ -1104,6 +1356,161 @@ def get_all_issue_cppcheck_ids() -> set:
         logger.error(f"Failed to get cppcheck IDs: {e}")
         raise
 
+def _build_review_filter(
+    statuses: Optional[Iterable[str]],
+    severities: Optional[Iterable[str]],
+    cppcheck_ids: Optional[Iterable[str]],
+    contradictory_only: bool
+) -> Tuple[List[str], List[Any]]:
+    """
+    Build SQL WHERE conditions for the Review Issues filters.
+    
+    Args:
+        statuses (Optional[Iterable[str]]): Status values to match; empty or None matches all.
+        severities (Optional[Iterable[str]]): Severity values to match; empty or None matches all.
+        cppcheck_ids (Optional[Iterable[str]]): cppcheck_id values to match; empty or None matches all.
+        contradictory_only (bool): If True, only match issues whose LLM classifications disagree.
+            
+    Returns:
+        Tuple[List[str], List[Any]]: The conditions and their bound parameters.
+    """
+    conditions = []
+    params = []
+    
+    for column, values in (("status", statuses), ("cppcheck_severity", severities), ("cppcheck_id", cppcheck_ids)):
+        values = list(values or ())
+        if values:
+            placeholders = ", ".join("?" for _ in values)
+            conditions.append(f"{column} IN ({placeholders})")
+            params.extend(values)
+    
+    if contradictory_only:
+        conditions.append("""id IN (
+            SELECT issue_id FROM llm_classifications
+            GROUP BY issue_id HAVING COUNT(DISTINCT classification) > 1
+        )""")
+    
+    return conditions, params
+
+def count_issues_by_filters(
+    statuses: Optional[Iterable[str]] = None,
+    severities: Optional[Iterable[str]] = None,
+    cppcheck_ids: Optional[Iterable[str]] = None,
+    contradictory_only: bool = False
+) -> int:
+    """
+    Count the issues matching the Review Issues filters.
+    
+    Args:
+        statuses (Optional[Iterable[str]]): Status values to match; empty or None matches all.
+        severities (Optional[Iterable[str]]): Severity values to match; empty or None matches all.
+        cppcheck_ids (Optional[Iterable[str]]): cppcheck_id values to match; empty or None matches all.
+        contradictory_only (bool): If True, only count issues whose LLM classifications disagree.
+            
+    Returns:
+        int: Number of matching issues.
+        
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    conditions, params = _build_review_filter(statuses, severities, cppcheck_ids, contradictory_only)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) AS count FROM issues{where}", params)
+            return cursor.fetchone()['count']
+    except sqlite3.Error as e:
+        logger.error(f"Failed to count issues by filters: {e}")
+        raise
+
+def get_issue_ids_by_filters(
+    statuses: Optional[Iterable[str]] = None,
+    severities: Optional[Iterable[str]] = None,
+    cppcheck_ids: Optional[Iterable[str]] = None,
+    contradictory_only: bool = False,
+    limit: int = 50,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve one page of the issues matching the Review Issues filters, newest first.
+    
+    Only the fields needed to list an issue are read: 'id', 'cppcheck_file' and
+    'cppcheck_line'. Use get_issue_by_id for the full issue.
+    
+    Args:
+        statuses (Optional[Iterable[str]]): Status values to match; empty or None matches all.
+        severities (Optional[Iterable[str]]): Severity values to match; empty or None matches all.
+        cppcheck_ids (Optional[Iterable[str]]): cppcheck_id values to match; empty or None matches all.
+        contradictory_only (bool): If True, only return issues whose LLM classifications disagree.
+        limit (int): Maximum number of issues to return.
+        offset (int): Number of matching issues to skip.
+            
+    Returns:
+        List[Dict[str, Any]]: List of dictionaries with the listed fields.
+        
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    conditions, params = _build_review_filter(statuses, severities, cppcheck_ids, contradictory_only)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = _dict_row_factory
+            cursor.execute(f"""
+                SELECT id, cppcheck_file, cppcheck_line FROM issues{where}
+                ORDER BY id DESC LIMIT ? OFFSET ?
+            """, params + [limit, offset])
+            return cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Failed to get issue IDs by filters: {e}")
+        raise
+
+def get_issue_position_by_filters(
+    issue_id: int,
+    statuses: Optional[Iterable[str]] = None,
+    severities: Optional[Iterable[str]] = None,
+    cppcheck_ids: Optional[Iterable[str]] = None,
+    contradictory_only: bool = False
+) -> Optional[int]:
+    """
+    Find the position of an issue among the issues matching the Review Issues filters.
+    
+    Args:
+        issue_id (int): ID of the issue to locate.
+        statuses (Optional[Iterable[str]]): Status values to match; empty or None matches all.
+        severities (Optional[Iterable[str]]): Severity values to match; empty or None matches all.
+        cppcheck_ids (Optional[Iterable[str]]): cppcheck_id values to match; empty or None matches all.
+        contradictory_only (bool): If True, only consider issues whose LLM classifications disagree.
+            
+    Returns:
+        Optional[int]: Zero-based position in the newest-first order used by
+        get_issue_ids_by_filters, or None if the issue doesn't match the filters.
+        
+    Raises:
+        sqlite3.Error: If a database error occurs.
+    """
+    conditions, params = _build_review_filter(statuses, severities, cppcheck_ids, contradictory_only)
+    where = " AND ".join(conditions + ["id = ?"])
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT 1 FROM issues WHERE {where}", params + [issue_id])
+            if cursor.fetchone() is None:
+                return None
+            
+            # Newer issues come first, so the position is the number of matching newer issues
+            where = " AND ".join(conditions + ["id > ?"])
+            cursor.execute(f"SELECT COUNT(*) AS count FROM issues WHERE {where}", params + [issue_id])
+            return cursor.fetchone()['count']
+    except sqlite3.Error as e:
+        logger.error(f"Failed to get issue position by filters: {e}")
+        raise
+
 def get_issues_by_filters(
     statuses: Optional[set] = None, 
     severities: Optional[set] = None, 
@@ -1118,7 +1525,8 @@ def get_issues_by_filters(
         severities (Optional[set]): Set of severity values to filter by.
         cppcheck_ids (Optional[set]): Set of cppcheck_id values to filter by.
         contradictory_only (bool): If True, only return issues with contradictory LLM classifications.
-            Contradictory means there are multiple classifications with different results.
+            Contradictory means there are multiple classifications with different results;
+            this is checked in SQL with GROUP BY/HAVING on the classifications.
             
     Returns:
         List[Dict[str, Any]]: List of issue dictionaries matching the criteria.
@@ -1126,60 +1534,18 @@ def get_issues_by_filters(
     Raises:
         sqlite3.Error: If a database error occurs.
     """
-    query = "SELECT * FROM issues"
-    conditions = []
-    params = []
-    
-    # Add filter conditions
-    if statuses:
-        placeholders = ", ".join("?" for _ in statuses)
-        conditions.append(f"status IN ({placeholders})")
-        params.extend(statuses)
-        
-    if severities:
-        placeholders = ", ".join("?" for _ in severities)
-        conditions.append(f"cppcheck_severity IN ({placeholders})")
-        params.extend(severities)
-        
-    if cppcheck_ids:
-        placeholders = ", ".join("?" for _ in cppcheck_ids)
-        conditions.append(f"cppcheck_id IN ({placeholders})")
-        params.extend(cppcheck_ids)
-    
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-    
-    query += " ORDER BY id DESC"
+    conditions, params = _build_review_filter(statuses, severities, cppcheck_ids, contradictory_only)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
     
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, params)
-            issues = [dict(row) for row in cursor.fetchall()]
-            
-            # Get classifications for each issue
-            for issue in issues:
-                cursor.execute("""
-                    SELECT * FROM llm_classifications WHERE issue_id = ?
-                    ORDER BY processing_timestamp DESC
-                """, (issue['id'],))
-                issue['llm_classifications'] = [dict(row) for row in cursor.fetchall()]
-            
-            # Filter for contradictory classifications if requested
-            if contradictory_only:
-                filtered_issues = []
-                for issue in issues:
-                    classifications = issue.get('llm_classifications', [])
-                    
-                    # Only include issues with multiple classifications
-                    if len(classifications) > 1:
-                        # Check if classifications are contradictory
-                        unique_classifications = {c['classification'] for c in classifications}
-                        if len(unique_classifications) > 1:
-                            filtered_issues.append(issue)
-                
-                return filtered_issues
+            cursor.row_factory = _dict_row_factory
+            cursor.execute(f"SELECT * FROM issues{where} ORDER BY id DESC", params)
+            issues = cursor.fetchall()
             
+            # Get classifications for all matching issues in one query
+            _attach_classifications(cursor, issues, f"SELECT id FROM issues{where}", params)
             return issues
     except sqlite3.Error as e:
         logger.error(f"Failed to get issues by filters: {e}")
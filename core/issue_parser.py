@@ -6,16 +6,23 @@ that can be used by the Review Helper application.
 
 import csv
 import io
-from typing import Dict, List, Union, Any
+import os
+import itertools
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
-def parse_cppcheck_csv(file_path_or_buffer: Union[str, io.BytesIO]) -> List[Dict[str, Any]]:
+# Columns every cppcheck CSV file must provide
+_REQUIRED_COLUMNS = frozenset(('File', 'Line', 'Severity', 'Id', 'Summary'))
+
+def parse_cppcheck_csv(file_path_or_buffer: Union[str, bytes, io.BytesIO]) -> List[Dict[str, Any]]:
     """Parse a cppcheck CSV output file into a list of issue dictionaries.
     
     Args:
-        file_path_or_buffer: Either a path to a CSV file or a file-like object containing CSV data.
+        file_path_or_buffer: Either a path to a CSV file, raw CSV bytes, or a binary
+            file-like object containing CSV data.
         
     Returns:
         A list of dictionaries, each representing a cppcheck issue with the following keys:
@@ -30,35 +37,142 @@ def parse_cppcheck_csv(file_path_or_buffer: Union[str, io.BytesIO]) -> List[Dict
         ValueError: If the CSV file is malformed or missing required columns
         IOError: If there are issues reading the file
     """
-    issues = []
-    required_columns = {'File', 'Line', 'Severity', 'Id', 'Summary'}
+    return _parse_source(file_path_or_buffer)
+
+def parse_cppcheck_csv_head(file_path_or_buffer: Union[str, bytes, io.BytesIO], n: int = 10) -> List[Dict[str, Any]]:
+    """Parse only the first issues of a cppcheck CSV output file.
     
-    try:
-        # Handle both file paths and file-like objects
-        if isinstance(file_path_or_buffer, str):
-            with open(file_path_or_buffer, 'r', encoding='utf-8') as f:
-                fields = f.readline().split(',')
-                fields = [field.strip() for field in fields]
-                rows = [line.strip().split(',', maxsplit=len(fields) - 1) for line in f if line.strip()]
-        else:
-            # Handle file-like objects (e.g., BytesIO)
-            content = file_path_or_buffer.getvalue().decode('utf-8')
-            fields = content.split(',')
-            fields = [field.strip() for field in fields]
-            rows = [line.strip().split(',', maxsplit=len(fields) - 1) for line in content.splitlines() if line.strip()]
+    Reading stops as soon as n issues have been parsed, so previewing a large
+    file does not cost a full parse. The header is validated the same way as in
+    parse_cppcheck_csv.
+    
+    Args:
+        file_path_or_buffer: Either a path to a CSV file, raw CSV bytes, or a binary
+            file-like object containing CSV data.
+        n: Maximum number of issues to return
+        
+    Returns:
+        A list of at most n issue dictionaries, in the format returned by
+        parse_cppcheck_csv.
         
-        # Convert rows to list[dict[str, str]]
-        rows = [{fields[i]: row[i] for i in range(len(fields))} for row in rows]
+    Raises:
+        FileNotFoundError: If file_path_or_buffer is a string and the file doesn't exist
+        ValueError: If the CSV file is malformed or missing required columns
+        IOError: If there are issues reading the file
+    """
+    return _parse_source(file_path_or_buffer, limit=n)
 
-        _validate_columns(fields, required_columns)
-        issues = _process_rows(rows)
-            
-        return issues
+def iter_cppcheck_csv_chunks(file_path_or_buffer: Union[str, bytes, io.BytesIO],
+                             chunksize: int = 50_000) -> Iterator[Tuple[List[Dict[str, Any]], float]]:
+    """Parse a cppcheck CSV output file in chunks of issues.
+    
+    Only one chunk is held in memory at a time, so large files can be loaded
+    into the database chunk by chunk.
+    
+    Args:
+        file_path_or_buffer: Either a path to a CSV file, raw CSV bytes, or a binary
+            file-like object containing CSV data.
+        chunksize: Number of data lines parsed per chunk
+        
+    Yields:
+        Tuples of (issues, fraction), where issues is a non-empty list of issue
+        dictionaries in the format returned by parse_cppcheck_csv, and fraction is
+        the share of the input read so far (0.0 to 1.0).
+        
+    Raises:
+        FileNotFoundError: If file_path_or_buffer is a string and the file doesn't exist
+        ValueError: If the CSV file is malformed or missing required columns
+        IOError: If there are issues reading the file
+    """
+    try:
+        with _open_text(file_path_or_buffer) as (f, size):
+            col_idx, rows = _read_rows(f, _REQUIRED_COLUMNS)
+            start_row = 2  # Account for header row
+            while True:
+                batch = list(itertools.islice(rows, chunksize))
+                if not batch:
+                    break
+                issues = _process_rows(batch, col_idx, start_row=start_row)
+                start_row += len(batch)
+                if issues:
+                    yield issues, min(f.buffer.tell() / size, 1.0) if size else 1.0
+    except Exception as e:
+        logger.error(f"Error parsing cppcheck CSV: {str(e)}")
+        raise
+
+def _parse_source(file_path_or_buffer: Union[str, bytes, io.BytesIO], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Open a file path, bytes or binary buffer as text and parse its issues.
+    
+    Args:
+        file_path_or_buffer: Either a path to a CSV file, raw CSV bytes, or a binary
+            file-like object containing CSV data.
+        limit: Maximum number of issues to parse, or None for all of them
         
+    Returns:
+        List of issue dictionaries
+    """
+    try:
+        with _open_text(file_path_or_buffer) as (f, _):
+            col_idx, rows = _read_rows(f, _REQUIRED_COLUMNS)
+            return _process_rows(rows, col_idx, limit)
     except Exception as e:
         logger.error(f"Error parsing cppcheck CSV: {str(e)}")
         raise
 
+@contextmanager
+def _open_text(file_path_or_buffer: Union[str, bytes, io.BytesIO]) -> Iterator[Tuple[io.TextIOWrapper, int]]:
+    """Open a file path, bytes or binary buffer as a UTF-8 text stream.
+    
+    Args:
+        file_path_or_buffer: Either a path to a CSV file, raw CSV bytes, or a binary
+            file-like object containing CSV data.
+        
+    Yields:
+        Tuple of the text stream, positioned at the start, and the input size in bytes
+    """
+    # Handle both file paths and file-like objects
+    if isinstance(file_path_or_buffer, str):
+        with open(file_path_or_buffer, 'r', encoding='utf-8') as f:
+            yield f, os.fstat(f.fileno()).st_size
+        return
+    
+    # Handle raw bytes and file-like objects (e.g., BytesIO), decoding as we read
+    # instead of copying the whole upload into one string
+    if isinstance(file_path_or_buffer, (bytes, bytearray, memoryview)):
+        file_path_or_buffer = io.BytesIO(file_path_or_buffer)
+    size = file_path_or_buffer.seek(0, io.SEEK_END)
+    file_path_or_buffer.seek(0)
+    text = io.TextIOWrapper(file_path_or_buffer, encoding='utf-8', newline='')
+    try:
+        yield text, size
+    finally:
+        # Detach so the caller's buffer is not closed along with the wrapper
+        text.detach()
+
+def _read_rows(f: io.TextIOBase, required_columns: set) -> Tuple[Dict[str, int], Iterator[List[str]]]:
+    """Validate the header of a text stream and split its data lines lazily.
+    
+    The header is checked before any data line is read, so files with missing
+    columns are rejected without parsing the rest. The last column (Summary) may
+    itself contain commas, so each line is split at most once per column boundary
+    instead of being parsed as quoted CSV.
+    
+    Args:
+        f: Text stream positioned at the header line
+        required_columns: Set of required column names
+        
+    Returns:
+        Tuple of the position of each required column and an iterator over the
+        split, non-empty data lines
+    """
+    header = f.readline().strip()
+    fields = [field.strip() for field in header.split(',')] if header else []
+    _validate_columns(fields, required_columns)
+    
+    col_idx = {name: fields.index(name) for name in required_columns}
+    rows = (line.strip().split(',', maxsplit=len(fields) - 1) for line in f if line.strip())
+    return col_idx, rows
+
 def _validate_columns(fieldnames: List[str], required_columns: set) -> None:
     """Validate that all required columns are present in the CSV.
     
@@ -76,33 +190,43 @@ def _validate_columns(fieldnames: List[str], required_columns: set) -> None:
     if missing_columns:
         raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
 
-def _process_rows(rows: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-    """Process CSV rows into issue dictionaries.
+def _process_rows(rows: Iterable[List[str]],
+                  col_idx: Dict[str, int],
+                  limit: Optional[int] = None,
+                  start_row: int = 2) -> List[Dict[str, Any]]:
+    """Process split CSV rows into issue dictionaries.
     
     Args:
-        reader: CSV DictReader object
+        rows: Iterable of rows, each a list of column values
+        col_idx: Position of each required column within a row
+        limit: Stop once this many issues have been processed; None processes all rows
+        start_row: Line number of the first row, used in warnings
         
     Returns:
         List of issue dictionaries
     """
+    file_idx = col_idx['File']
+    line_idx = col_idx['Line']
+    severity_idx = col_idx['Severity']
+    id_idx = col_idx['Id']
+    summary_idx = col_idx['Summary']
+    
     issues = []
-    for row_num, row in enumerate(rows, start=2):  # Start from 2 to account for header row
+    for row_num, row in enumerate(rows, start=start_row):
         try:
-            # Convert Line to integer
-            row['Line'] = int(row['Line'])
-            
-            # Create a new dict to avoid modifying the original
-            issue = {
-                'cppcheck_file': row['File'],
-                'cppcheck_line': row['Line'],
-                'cppcheck_severity': row['Severity'],
-                'cppcheck_id': row['Id'],
-                'cppcheck_summary': row['Summary']
-            }
-            issues.append(issue)
+            issues.append({
+                'cppcheck_file': row[file_idx],
+                'cppcheck_line': int(row[line_idx]),
+                'cppcheck_severity': row[severity_idx],
+                'cppcheck_id': row[id_idx],
+                'cppcheck_summary': row[summary_idx]
+            })
             
-        except (ValueError, KeyError) as e:
+        except (ValueError, IndexError) as e:
             logger.warning(f"Error processing row {row_num}: {str(e)}")
             continue
+        
+        if limit is not None and len(issues) >= limit:
+            break
             
-    return issues 
\ No newline at end of file
+    return issues
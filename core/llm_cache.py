@@ -0,0 +1,116 @@
+"""
+Module for caching LLM classification responses.
+
+cppcheck frequently reports the same problem (same rule ID, summary and code) at
+several locations, and deterministic model settings return the same answer for the
+same prompt. This module lets the LLM service reuse a classification in both cases
+instead of sending another request.
+"""
+
+import re
+import hashlib
+import threading
+import orjson
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+# Issue fields that only describe where an issue was reported, not what it is
+LOCATION_FIELDS = frozenset(('file', 'line', 'main_file', 'line_number'))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class ResponseCache:
+    """Bounded in-memory LRU cache of (result, response_metrics) tuples, safe to share between threads."""
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize the ResponseCache.
+
+        Args:
+            max_entries (int): Maximum number of cached responses; the least recently
+                used entry is evicted when the cache is full.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+        # The owning LLMService is shared across sessions and classifies from a thread pool
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_issue_key(llm_name: str, prompt_template: str, issue_content: Dict[str, Any]) -> Tuple:
+        """
+        Build the cache key for an issue.
+
+        Location fields are ignored and whitespace is collapsed, so the same issue
+        reported in different files or with different indentation shares a key.
+
+        Args:
+            llm_name (str): Name of the LLM configuration.
+            prompt_template (str): Filename of the prompt template.
+            issue_content (Dict[str, Any]): Issue fields used to format the prompt.
+
+        Returns:
+            Tuple: Hashable cache key.
+        """
+        fields = tuple(sorted(
+            (name, _WHITESPACE_RE.sub(' ', str(value)).strip())
+            for name, value in issue_content.items()
+            if name not in LOCATION_FIELDS
+        ))
+        return (llm_name, prompt_template, fields)
+
+    @staticmethod
+    def make_prompt_key(model_params: Dict[str, Any], prompt: str) -> str:
+        """
+        Build the cache key for an exact prompt sent with the given model parameters.
+
+        Args:
+            model_params (Dict[str, Any]): Model name and sampling parameters.
+            prompt (str): Fully formatted prompt.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(orjson.dumps(model_params, option=orjson.OPT_SORT_KEYS))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: Any) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (Any): Key returned by make_issue_key or make_prompt_key.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], Dict[str, Any]]]: Copies of the cached
+            (result, response_metrics), or None if the key is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        result, metrics = entry
+        return dict(result), dict(metrics)
+
+    def put(self, key: Any, result: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            key (Any): Key returned by make_issue_key or make_prompt_key.
+            result (Dict[str, Any]): Classification result.
+            metrics (Dict[str, Any]): Response metrics.
+        """
+        entry = (dict(result), dict(metrics))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
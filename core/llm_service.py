@@ -7,11 +7,19 @@ This module provides functionality to:
 
 Example prompt template (prompts/classification_default.txt):
 ```text
-You are a code review assistant. Analyze the following cppcheck issue and classify it as either:
+You are a code review assistant. Analyze the cppcheck issue at the end of this message and classify it as either:
 - "false positive": The issue is not a real problem
 - "need fixing": The issue should be fixed but is not critical
 - "very serious": The issue is critical and must be fixed immediately
 
+Please provide your analysis in JSON format:
+```json
+{
+    "classification": "one of: false positive, need fixing, very serious",
+    "explanation": "detailed explanation of your reasoning"
+}
+```
+
 Issue details:
 File: {file}
 Line: {line}
@@ -21,13 +29,8 @@ Summary: {summary}
 Code Context:
 {code_context}
 
-Please provide your analysis in JSON format:
-```json
-{
-    "classification": "one of: false positive, need fixing, very serious",
-    "explanation": "detailed explanation of your reasoning"
-}
-```
+The fixed instructions come first and the per-issue fields last, so consecutive
+requests share a long identical prefix that providers can serve from their prompt cache.
 
 Example input dictionary:
 {
@@ -41,17 +44,230 @@ Example input dictionary:
 """
 
 import os
-import json
-from typing import Dict, List, Optional, Any, Tuple
+import copy
+import asyncio
+import re
+import string
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union, Callable
 import yaml
+import orjson
 from pathlib import Path
 import openai
 from dotenv import load_dotenv
 import time
+from core.llm_cache import ResponseCache
+
+# tiktoken is optional; without it token counts fall back to a character-based estimate
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 
 # Load environment variables
 load_dotenv()
 
+@lru_cache(maxsize=32)
+def _compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """Compile a prompt template into a render function.
+    
+    The template is parsed once; rendering then only joins literal parts with the
+    looked-up field values. Templates using conversions, format specs or attribute
+    and index access fall back to str.format.
+    
+    Args:
+        template: Prompt template in str.format syntax
+        
+    Returns:
+        Function rendering the template from a dictionary of field values
+        
+    Raises:
+        ValueError: If the template syntax is invalid
+    """
+    parts = list(string.Formatter().parse(template))
+    if any(
+        field is not None and (conversion or spec or not field.isidentifier())
+        for _, field, spec, conversion in parts
+    ):
+        return lambda values: template.format(**values)
+    
+    literals = [literal for literal, _, _, _ in parts]
+    fields = [field for _, field, _, _ in parts]
+    
+    def render(values: Dict[str, Any]) -> str:
+        pieces = []
+        for literal, field in zip(literals, fields):
+            pieces.append(literal)
+            if field is not None:
+                pieces.append(str(values[field]))
+        return "".join(pieces)
+    
+    return render
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding for a model.
+    
+    Args:
+        model: Model name
+        
+    Returns:
+        Encoding for the model (cl100k_base for models tiktoken does not know), or
+        None if tiktoken is unavailable or its encoding files cannot be loaded
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+@lru_cache(maxsize=1024)
+def _count_tokens(text: str, model: str) -> int:
+    """Count the tokens in text, memoized for prompts that are counted repeatedly.
+    
+    Args:
+        text: Text to count tokens for
+        model: Model name (used to select appropriate tokenizer)
+        
+    Returns:
+        Token count from the model's tiktoken encoding, or a rough estimate of
+        1 token ~= 4 chars for English text when no encoding is available
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Very rough estimate for English text
+    return len(text) // 4
+
+# Providers with a classification implementation in LLMService
+SUPPORTED_PROVIDERS = frozenset(('openai',))
+
+# Kept byte-identical across requests so it stays part of the cacheable prompt prefix
+SYSTEM_PROMPT = "You are a code review assistant."
+
+# Retries for rate limits (429), server errors (5xx) and timeouts. The OpenAI client backs
+# off exponentially with jitter and honours the Retry-After header between attempts.
+DEFAULT_MAX_RETRIES = 5
+
+# JSON object in a fenced code block (any fence tag casing)
+_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL | re.IGNORECASE)
+
+def _find_json_object(text: str) -> Optional[str]:
+    """Find the first balanced JSON object in text.
+    
+    Single forward pass tracking brace depth and string/escape state, so braces
+    inside JSON strings are ignored and trailing prose is never scanned.
+    
+    Args:
+        text: Text that may contain a JSON object
+        
+    Returns:
+        Substring from the first "{" to its matching "}", or None if there is none
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+# Allowed values for the "classification" field of a response
+VALID_CLASSIFICATIONS = frozenset(("false positive", "need fixing", "very serious"))
+
+# Fields every classification response must contain
+_REQUIRED_RESULT_FIELDS = frozenset(("classification", "explanation"))
+
+def _extract_classification(content: str) -> Dict[str, str]:
+    """Extract and validate the classification JSON from a response message.
+    
+    Pure CPU work with no service state, kept separate from the request I/O.
+    
+    Args:
+        content: Message content returned by the LLM
+        
+    Returns:
+        Dictionary with classification and explanation
+        
+    Raises:
+        RuntimeError: If the content holds no valid JSON object or it has an invalid structure
+    """
+    # Responses in JSON mode are a bare object; parse them without scanning
+    result = None
+    stripped = content.strip()
+    if stripped.startswith('{'):
+        try:
+            result = orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+    
+    try:
+        if result is None:
+            # Extract JSON from response, preferring a fenced block anywhere in the text
+            match = _CODE_BLOCK_RE.search(content)
+            if match is not None:
+                json_str = match.group(1)
+            else:
+                json_str = _find_json_object(content)
+                if json_str is None:
+                    raise RuntimeError("Invalid response structure: no JSON object in response")
+            result = orjson.loads(json_str)
+        
+        if not isinstance(result, dict) or not _REQUIRED_RESULT_FIELDS <= result.keys():
+            raise ValueError("Invalid JSON structure")
+            
+        # Validate classification value
+        classification = result["classification"]
+        if not isinstance(classification, str) or classification not in VALID_CLASSIFICATIONS:
+            raise ValueError(f"Invalid classification value: {result['classification']}")
+        
+        return result
+        
+    except orjson.JSONDecodeError as e:
+        raise RuntimeError(f"Invalid JSON response from LLM: {str(e)}")
+    except ValueError as e:
+        raise RuntimeError(f"Invalid response structure: {str(e)}")
+
+# Parsed LLM configurations keyed by absolute path, stored with the file's (mtime, size)
+# and bounded to the most recently used _CONFIG_CACHE_SIZE files
+_CONFIG_CACHE: "OrderedDict[str, Tuple[Tuple[float, int], Dict[str, Any]]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 32
+
+# Maximum number of template files whose contents an LLMService keeps cached
+_TEMPLATE_CACHE_SIZE = 64
+
 class LLMService:
     """Service class for handling LLM interactions and configurations."""
     
@@ -63,28 +279,80 @@ class LLMService:
         """
         self.config_path = config_path
         self.llm_configs = self._load_llm_configurations()
+        # Classification method for each entry of SUPPORTED_PROVIDERS
+        self._providers = {'openai': self._classify_with_openai}
+        self._issue_cache = ResponseCache()
+        # Prompt directory listings and template contents, stored with the mtime (and size) they were read at
+        self._template_list_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._template_cache: "OrderedDict[str, Tuple[Tuple[float, int], str]]" = OrderedDict()
+        self._prompt_cache = ResponseCache()
+        # OpenAI clients keyed by (api_key, base_url, max_retries), reused to keep connections alive
+        self._clients: Dict[Tuple[str, str, int], openai.OpenAI] = {}
         
     def _load_llm_configurations(self) -> Dict[str, Any]:
         """Load LLM configurations from YAML file.
         
+        The parsed file is validated once and cached per process; it is re-read only
+        when its mtime or size changes.
+        
         Returns:
             Dictionary of LLM configurations
             
         Raises:
             FileNotFoundError: If config file doesn't exist
             yaml.YAMLError: If YAML is invalid
+            ValueError: If an entry is missing provider or model, or uses an unsupported provider
         """
         try:
-            with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+            path = os.path.abspath(self.config_path)
+            stat = os.stat(path)
+            # Size catches rewrites within the filesystem's mtime granularity
+            version = (stat.st_mtime, stat.st_size)
+            cached = _CONFIG_CACHE.get(path)
+            if cached is None or cached[0] != version:
+                with open(path, 'r') as f:
+                    configs = yaml.load(f, Loader=_SafeLoader) or {}
+                self._validate_llm_configurations(configs)
+                cached = (version, configs)
+                _CONFIG_CACHE[path] = cached
+                if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+                    _CONFIG_CACHE.popitem(last=False)
+            _CONFIG_CACHE.move_to_end(path)
+            # Callers may modify their configurations, so never hand out the cached dict
+            configs = copy.deepcopy(cached[1])
+            # Resolve environment API keys once here rather than on every request
+            for config in configs.values():
+                if config.get('api_key_env'):
+                    config['api_key'] = os.environ.get(config['api_key_env'])
+            return configs
         except FileNotFoundError:
             raise FileNotFoundError(f"LLM configuration file not found: {self.config_path}")
         except yaml.YAMLError as e:
             raise yaml.YAMLError(f"Invalid YAML in {self.config_path}: {str(e)}")
             
+    def _validate_llm_configurations(self, configs: Dict[str, Any]) -> None:
+        """Check that every LLM configuration can be used for classification.
+        
+        Args:
+            configs: Parsed LLM configurations
+            
+        Raises:
+            ValueError: If an entry is missing provider or model, or uses an unsupported provider
+        """
+        if not isinstance(configs, dict):
+            raise ValueError(f"Invalid LLM configuration file {self.config_path}: expected a mapping of model names")
+        
+        for llm_name, config in configs.items():
+            if not isinstance(config, dict) or 'provider' not in config or 'model' not in config:
+                raise ValueError(f"Invalid LLM configuration for {llm_name}. Missing provider or model.")
+            if config['provider'] not in SUPPORTED_PROVIDERS:
+                raise ValueError(f"Unsupported LLM provider for {llm_name}: {config['provider']}")
+            
     def list_prompt_templates(self, prompts_dir: str = "prompts") -> List[str]:
         """List available prompt templates.
         
+        The listing is cached until the directory's mtime changes.
+        
         Args:
             prompts_dir: Directory containing prompt templates
             
@@ -94,11 +362,24 @@ class LLMService:
         prompt_dir = Path(prompts_dir)
         if not prompt_dir.exists():
             return []
-        return [f.name for f in prompt_dir.glob("*.txt")]
+        
+        # Adding, removing or renaming a file updates the directory's mtime
+        try:
+            mtime = prompt_dir.stat().st_mtime
+        except OSError:
+            return [f.name for f in prompt_dir.glob("*.txt")]
+
+        cached = self._template_list_cache.get(prompts_dir)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, [f.name for f in prompt_dir.glob("*.txt")])
+            self._template_list_cache[prompts_dir] = cached
+        return list(cached[1])
     
     def load_prompt_template(self, template_path: str) -> str:
         """Load prompt template content.
         
+        File contents are cached until the file's mtime or size changes.
+        
         Args:
             template_path: Path to prompt template file
             
@@ -108,11 +389,29 @@ class LLMService:
         Raises:
             FileNotFoundError: If template file doesn't exist
         """
+        try:
+            stat = os.stat(template_path)
+            version = (stat.st_mtime, stat.st_size)
+        except OSError:
+            version = None
+        
+        cached = self._template_cache.get(template_path)
+        if cached is not None and version is not None and cached[0] == version:
+            self._template_cache.move_to_end(template_path)
+            return cached[1]
+        
         try:
             with open(template_path, 'r') as f:
-                return f.read().strip()
+                content = f.read().strip()
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt template not found: {template_path}")
+        
+        if version is not None:
+            self._template_cache[template_path] = (version, content)
+            self._template_cache.move_to_end(template_path)
+            if len(self._template_cache) > _TEMPLATE_CACHE_SIZE:
+                self._template_cache.popitem(last=False)
+        return content
             
     def classify_issue(self, 
                       issue_content: Dict[str, str], 
@@ -137,38 +436,582 @@ class LLMService:
             ValueError: If required API key not set or prompt template not found
             RuntimeError: If LLM processing fails
         """
+        formatted_prompt, config = self._prepare_prompt(issue_content, llm_name, prompt_template, max_chars)
+        return self._classify_prompt(issue_content, formatted_prompt, llm_name, prompt_template, config)
+    
+    def classify_issues(self,
+                        issues: List[Dict[str, str]],
+                        llm_name: str,
+                        prompt_template: str,
+                        max_chars: int = 65536) -> List[Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]]:
+        """Classify several issues one after another using specified LLM.
+        
+        The configuration and template are looked up and compiled once for the whole
+        list instead of once per issue.
+        
+        Args:
+            issues: List of dictionaries containing issue details
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            max_chars: Maximum number of characters in each prompt
+            
+        Returns:
+            One entry per issue, in input order: either the (result, metrics) tuple
+            returned by classify_issue, or the exception raised for that issue
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            ValueError: If prompt template not found
+        """
+        config = self._get_config(llm_name)
+        render = _compile_template(self._get_template(prompt_template))
+        
+        results: List[Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]] = []
+        for issue_content in issues:
+            try:
+                formatted_prompt = self._render_prompt(issue_content, render, config, max_chars)
+                results.append(self._classify_prompt(issue_content, formatted_prompt, llm_name, prompt_template, config))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _classify_prompt(self,
+                         issue_content: Dict[str, str],
+                         formatted_prompt: str,
+                         llm_name: str,
+                         prompt_template: str,
+                         config: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Classify an issue whose prompt has already been built.
+        
+        Args:
+            issue_content: Dictionary containing issue details
+            formatted_prompt: Prompt built from issue_content
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            config: LLM configuration dictionary
+            
+        Returns:
+            Same as classify_issue
+            
+        Raises:
+            ValueError: If required API key not set
+            RuntimeError: If LLM processing fails
+        """
+        # Reuse the classification of an identical issue reported elsewhere
+        cache_key = None
+        if config.get('issue_cache', False):
+            cache_key = ResponseCache.make_issue_key(llm_name, prompt_template, issue_content)
+            cached = self._issue_cache.get(cache_key)
+            if cached is not None:
+                return self._cache_hit_response(cached, formatted_prompt)
+        
+        # Dispatch to appropriate provider (validated when the configuration was loaded)
+        result, response_metrics = self._providers[config['provider']](formatted_prompt, config)
+        
+        if cache_key is not None:
+            self._issue_cache.put(cache_key, result, response_metrics)
+        return result, response_metrics
+    
+    def classify_batch(self,
+                       issues: List[Dict[str, str]],
+                       llm_name: str,
+                       prompt_template: str,
+                       max_chars: int = 65536,
+                       concurrency: Optional[int] = None) -> List[Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]]:
+        """Classify several issues concurrently using specified LLM.
+        
+        Blocking wrapper around classify_issues_async for callers without an event loop.
+        
+        Args:
+            issues: List of dictionaries containing issue details
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            max_chars: Maximum number of characters in each prompt
+            concurrency: Maximum number of requests in flight; defaults to the
+                configuration's max_concurrency
+            
+        Returns:
+            One entry per issue, in input order: either the (result, metrics) tuple
+            returned by classify_issue, or the exception raised for that issue
+        """
+        return asyncio.run(self.classify_issues_async(issues, llm_name, prompt_template, max_chars, concurrency))
+    
+    async def classify_issues_async(self,
+                                    issues: List[Dict[str, str]],
+                                    llm_name: str,
+                                    prompt_template: str,
+                                    max_chars: int = 65536,
+                                    concurrency: Optional[int] = None) -> List[Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]]:
+        """Classify several issues concurrently using specified LLM.
+        
+        Requests are sent concurrently, with at most `concurrency` (by default
+        `max_concurrency` from the LLM configuration, or 8) in flight at once.
+        
+        Args:
+            issues: List of dictionaries containing issue details
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            max_chars: Maximum number of characters in each prompt
+            concurrency: Maximum number of requests in flight; defaults to the
+                configuration's max_concurrency
+            
+        Returns:
+            One entry per issue, in input order: either the (result, metrics) tuple
+            returned by classify_issue, or the exception raised for that issue
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            ValueError: If required API key not set, prompt template not found or provider unsupported
+        """
         if llm_name not in self.llm_configs:
             raise KeyError(f"LLM configuration not found: {llm_name}")
+        
+        config = self.llm_configs[llm_name]
+        if config.get('provider') != 'openai':
+            raise ValueError(f"Unsupported LLM provider: {config.get('provider')}")
+        
+        semaphore = asyncio.Semaphore(concurrency or config.get('max_concurrency', 8))
+        
+        async def classify_one(client: openai.AsyncOpenAI, issue_content: Dict[str, str]):
+            formatted_prompt, _ = self._prepare_prompt(issue_content, llm_name, prompt_template, max_chars)
+            cache_key = None
+            if config.get('issue_cache', False):
+                cache_key = ResponseCache.make_issue_key(llm_name, prompt_template, issue_content)
+                cached = self._issue_cache.get(cache_key)
+                if cached is not None:
+                    return self._cache_hit_response(cached, formatted_prompt)
+            result, response_metrics = await self._classify_with_openai_async(client, formatted_prompt, config, semaphore)
+            if cache_key is not None:
+                self._issue_cache.put(cache_key, result, response_metrics)
+            return result, response_metrics
+        
+        # One client per call: its connection pool belongs to the running event loop
+        async with openai.AsyncOpenAI(api_key=self._get_api_key(config),
+                                      base_url=config.get('base_url', "https://api.openai.com/v1"),
+                                      max_retries=config.get('max_retries', DEFAULT_MAX_RETRIES)) as client:
+            return await asyncio.gather(
+                *(classify_one(client, issue_content) for issue_content in issues),
+                return_exceptions=True
+            )
+    
+    def classify_issues_batch_api(self,
+                                  issues: List[Dict[str, str]],
+                                  llm_name: str,
+                                  prompt_template: str,
+                                  max_chars: int = 65536,
+                                  poll_interval: float = 10.0,
+                                  max_poll_interval: float = 300.0) -> List[Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]]:
+        """Classify several issues offline through the OpenAI Batch API.
+        
+        All requests are uploaded as one JSONL file and processed by the provider
+        within its 24h completion window, at a reduced token price. This call blocks,
+        polling the batch with exponential backoff until it finishes. Use submit_batch,
+        poll_batch and fetch_batch_results directly to avoid blocking.
+        
+        Args:
+            issues: List of dictionaries containing issue details
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            max_chars: Maximum number of characters in each prompt
+            poll_interval: Initial delay between status checks in seconds
+            max_poll_interval: Upper bound for the delay between status checks
+            
+        Returns:
+            One entry per issue, in input order: either the (result, metrics) tuple
+            returned by classify_issue, or the exception for that issue
             
+        Raises:
+            KeyError: If LLM configuration not found
+            ValueError: If required API key not set, prompt template not found or provider unsupported
+            RuntimeError: If the batch fails, expires or is cancelled
+        """
+        batch_id = self.submit_batch(issues, llm_name, prompt_template, max_chars)
+        self.poll_batch(batch_id, llm_name, poll_interval, max_poll_interval)
+        results = self.fetch_batch_results(batch_id, llm_name)
+        return [
+            results.get(str(i), RuntimeError("No response returned for this request"))
+            for i in range(len(issues))
+        ]
+    
+    def submit_batch(self,
+                     issues: List[Dict[str, str]],
+                     llm_name: str,
+                     prompt_template: str,
+                     max_chars: int = 65536) -> str:
+        """Submit issues for classification as an OpenAI Batch API job.
+        
+        Args:
+            issues: List of dictionaries containing issue details
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            max_chars: Maximum number of characters in each prompt
+            
+        Returns:
+            Batch ID. Each request's custom_id is the position of its issue in `issues`.
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            ValueError: If required API key not set, prompt template not found or provider unsupported
+        """
+        config = self._get_batch_config(llm_name)
+        model_params = self._get_model_parameters(config)
+        
+        # One request per line, matched back to its issue through custom_id
+        batch_input = b"\n".join(
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_request(
+                    self._prepare_prompt(issue_content, llm_name, prompt_template, max_chars)[0],
+                    model_params
+                )
+            })
+            for i, issue_content in enumerate(issues)
+        )
+        
+        client = self._get_client(config)
+        input_file = client.files.create(
+            file=("batch_input.jsonl", batch_input),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def poll_batch(self,
+                   batch_id: str,
+                   llm_name: str,
+                   poll_interval: float = 10.0,
+                   max_poll_interval: float = 300.0) -> Any:
+        """Wait for an OpenAI Batch API job to finish.
+        
+        Args:
+            batch_id: ID returned by submit_batch
+            llm_name: Name of LLM configuration the batch was submitted with
+            poll_interval: Initial delay between status checks in seconds
+            max_poll_interval: Upper bound for the delay between status checks
+            
+        Returns:
+            The completed batch object
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            RuntimeError: If the batch fails, expires or is cancelled
+        """
+        client = self._get_client(self._get_batch_config(llm_name))
+        batch = client.batches.retrieve(batch_id)
+        
+        # Poll with exponential backoff until the batch reaches a final state
+        delay = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            batch = client.batches.retrieve(batch_id)
+        
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch_id} ended with status: {batch.status}")
+        return batch
+    
+    def fetch_batch_results(self,
+                            batch_id: str,
+                            llm_name: str) -> Dict[str, Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]]:
+        """Download and parse the results of a completed OpenAI Batch API job.
+        
+        Args:
+            batch_id: ID returned by submit_batch
+            llm_name: Name of LLM configuration the batch was submitted with
+            
+        Returns:
+            Dictionary mapping each custom_id to either the (result, metrics) tuple
+            returned by classify_issue, or the exception for that request
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            RuntimeError: If the batch has not completed
+        """
+        config = self._get_batch_config(llm_name)
+        model_params = self._get_model_parameters(config)
+        client = self._get_client(config)
+        batch = client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch_id} is not completed: {batch.status}")
+        
+        # Recover the prompts from the uploaded input so metrics match classify_issue
+        prompts = {}
+        for line in client.files.content(batch.input_file_id).text.splitlines():
+            if line.strip():
+                request = orjson.loads(line)
+                prompts[request['custom_id']] = request['body']['messages'][-1]['content']
+        
+        results: Dict[str, Union[Tuple[Dict[str, str], Dict[str, Any]], Exception]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = orjson.loads(line)
+                custom_id = entry['custom_id']
+                response = entry.get('response') or {}
+                if entry.get('error') or response.get('status_code') != 200:
+                    error = entry.get('error') or response.get('body')
+                    results[custom_id] = RuntimeError(f"OpenAI API error: {error}")
+                    continue
+                try:
+                    completion = openai.types.chat.ChatCompletion.model_validate(response['body'])
+                    results[custom_id] = self._parse_response(prompts.get(custom_id, ''), completion, None, model_params)
+                except Exception as e:
+                    results[custom_id] = RuntimeError(f"OpenAI API error: {str(e)}")
+        return results
+    
+    def _get_batch_config(self, llm_name: str) -> Dict[str, Any]:
+        """Get the configuration of an LLM used through the OpenAI Batch API.
+        
+        Args:
+            llm_name: Name of LLM configuration to use
+            
+        Returns:
+            LLM configuration dictionary
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            ValueError: If the provider does not support the Batch API
+        """
+        if llm_name not in self.llm_configs:
+            raise KeyError(f"LLM configuration not found: {llm_name}")
+        
         config = self.llm_configs[llm_name]
+        if config.get('provider') != 'openai':
+            raise ValueError(f"Unsupported LLM provider: {config.get('provider')}")
+        return config
+    
+    def _resolve_template_path(self, prompt_template: str) -> str:
+        """Get the path of a prompt template file.
         
-        # Validate configuration
-        if 'provider' not in config or 'model' not in config:
-            raise ValueError(f"Invalid LLM configuration for {llm_name}. Missing provider or model.")
+        Args:
+            prompt_template: Filename of the prompt template
             
-        # Load the prompt template
+        Returns:
+            Path of the template inside the prompts directory
+        """
+        return os.path.join("prompts", prompt_template)
+    
+    def _get_template(self, prompt_template: str) -> str:
+        """Get prompt template content by filename.
+        
+        Contents come from the template cache, so classifying an issue only stats the
+        file and an edited template is picked up on the next call.
+        
+        Args:
+            prompt_template: Filename of the prompt template
+            
+        Returns:
+            Template content as string
+            
+        Raises:
+            ValueError: If prompt template not found
+        """
         try:
-            prompt_template_path = os.path.join("prompts", prompt_template)
-            prompt_content = self.load_prompt_template(prompt_template_path)
+            return self.load_prompt_template(self._resolve_template_path(prompt_template))
         except FileNotFoundError:
             raise ValueError(f"Prompt template not found: {prompt_template}")
+    
+    def _prepare_prompt(self,
+                        issue_content: Dict[str, str],
+                        llm_name: str,
+                        prompt_template: str,
+                        max_chars: int) -> Tuple[str, Dict[str, Any]]:
+        """Look up the LLM configuration and build the prompt for an issue.
+        
+        Args:
+            issue_content: Dictionary containing issue details
+            llm_name: Name of LLM configuration to use
+            prompt_template: Filename of the prompt template
+            max_chars: Maximum number of characters in the prompt
+            
+        Returns:
+            Tuple of the formatted prompt and the LLM configuration
+            
+        Raises:
+            KeyError: If LLM configuration not found
+            ValueError: If prompt template not found
+        """
+        config = self._get_config(llm_name)
+        render = _compile_template(self._get_template(prompt_template))
+        return self._render_prompt(issue_content, render, config, max_chars), config
+    
+    def _get_config(self, llm_name: str) -> Dict[str, Any]:
+        """Get an LLM configuration by name.
         
+        Args:
+            llm_name: Name of LLM configuration
+            
+        Returns:
+            LLM configuration dictionary
+            
+        Raises:
+            KeyError: If LLM configuration not found
+        """
+        if llm_name not in self.llm_configs:
+            raise KeyError(f"LLM configuration not found: {llm_name}")
+        return self.llm_configs[llm_name]
+    
+    def _render_prompt(self,
+                       issue_content: Dict[str, str],
+                       render: Callable[[Dict[str, Any]], str],
+                       config: Dict[str, Any],
+                       max_chars: int) -> str:
+        """Build the prompt for an issue from a compiled template.
+        
+        Args:
+            issue_content: Dictionary containing issue details
+            render: Compiled template from _compile_template
+            config: LLM configuration dictionary
+            max_chars: Maximum number of characters in the prompt
+            
+        Returns:
+            Formatted prompt, shortened to fit the context window and max_chars
+        """
         # Format prompt with issue content
-        formatted_prompt = prompt_content.format(**issue_content)
+        formatted_prompt = render(issue_content)
+        
+        # Shorten the code context up front rather than send a request that cannot fit
+        context_window = config.get('context_window')
+        if context_window and 'code_context' in issue_content:
+            budget = context_window - config.get('max_tokens', 2000)
+            tokens = self.get_token_counts(formatted_prompt, config['model'])['estimated_tokens']
+            if tokens > budget:
+                code_context = str(issue_content['code_context'])
+                marker = "\n... (truncated)"
+                excess_chars = (tokens - budget) * len(formatted_prompt) // tokens + 1 + len(marker)
+                issue_content = dict(issue_content, code_context=(
+                    code_context[:max(0, len(code_context) - excess_chars)] + marker
+                ))
+                formatted_prompt = render(issue_content)
         
         if len(formatted_prompt) > max_chars:
             print(f"Prompt is too long. Max characters: {max_chars}")
             print(f"Prompt length: {len(formatted_prompt)}")
             formatted_prompt = formatted_prompt[:max_chars] + "\n\n... (truncated)"
         
-        # Dispatch to appropriate provider
-        if config['provider'] == 'openai':
-            return self._classify_with_openai(
-                formatted_prompt,
-                config
-            )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {config['provider']}")
+        return formatted_prompt
+    
+    def _prompt_cache_key(self, model_params: Dict[str, Any], prompt: str) -> Optional[str]:
+        """Get the exact-match cache key for a request.
+        
+        Args:
+            model_params: Model parameters for the request
+            prompt: Formatted prompt
+            
+        Returns:
+            Cache key, or None if the sampling parameters are not deterministic
+        """
+        if model_params['temperature'] != 0.0 or model_params['top_p'] != 1.0:
+            return None
+        return ResponseCache.make_prompt_key(model_params, prompt)
+    
+    def _cache_hit_response(self,
+                            cached: Tuple[Dict[str, str], Dict[str, Any]],
+                            formatted_prompt: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Build the response for a request answered from a response cache.
+        
+        Args:
+            cached: Cached (result, response_metrics) tuple
+            formatted_prompt: Prompt built for the current request
+            
+        Returns:
+            The cached result and metrics describing the current prompt, with no
+            tokens or response time spent and `cache_hit` set to True
+        """
+        result, response_metrics = cached
+        response_metrics.update({
+            'full_prompt': formatted_prompt,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'total_tokens': 0,
+            'response_time_ms': 0,
+            'cache_hit': True
+        })
+        return result, response_metrics
+    
+    def _get_client(self, config: Dict[str, Any]) -> openai.OpenAI:
+        """Get the pooled OpenAI client for an LLM configuration.
+        
+        Args:
+            config: LLM configuration dictionary
+            
+        Returns:
+            OpenAI client shared by all configurations with the same endpoint and key
+            
+        Raises:
+            ValueError: If no API key is found
+        """
+        key = (
+            self._get_api_key(config),
+            config.get('base_url', "https://api.openai.com/v1"),
+            config.get('max_retries', DEFAULT_MAX_RETRIES)
+        )
+        client = self._clients.get(key)
+        if client is None:
+            client = openai.OpenAI(api_key=key[0], base_url=key[1], max_retries=key[2])
+            self._clients[key] = client
+        return client
+    
+    def close(self) -> None:
+        """Close the pooled OpenAI clients and their connections.
+        
+        The service stays usable; clients are recreated on the next request.
+        """
+        for client in self._clients.values():
+            client.close()
+        self._clients.clear()
+    
+    def _get_api_key(self, config: Dict[str, Any]) -> str:
+        """Get the API key for an LLM configuration.
+        
+        Keys named by api_key_env are resolved from the environment when the
+        configuration is loaded.
+        
+        Args:
+            config: LLM configuration dictionary
+            
+        Returns:
+            API key from the config, or from the environment variable named by api_key_env
+            
+        Raises:
+            ValueError: If no API key is found
+        """
+        api_key = config.get('api_key')
+        if not api_key:
+            raise ValueError(f"API key not found for LLM configuration. Please check your models.yaml file or environment variables.")
+        
+        return api_key
+    
+    def _get_model_parameters(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the request parameters for an LLM configuration.
+        
+        Args:
+            config: LLM configuration dictionary
+            
+        Returns:
+            Dictionary with model, temperature, max_tokens and top_p, plus
+            prompt_cache_key and json_mode when the configuration sets them
+        """
+        model_params = {
+            'model': config['model'],
+            'temperature': config.get('temperature', 0.0),
+            'max_tokens': config.get('max_tokens', 2000),
+            'top_p': config.get('top_p', 1.0)
+        }
+        if config.get('prompt_cache_key'):
+            model_params['prompt_cache_key'] = config['prompt_cache_key']
+        if config.get('json_mode'):
+            model_params['json_mode'] = True
+        return model_params
             
     def _classify_with_openai(self, 
                             prompt: str, 
@@ -188,96 +1031,254 @@ class LLMService:
             RuntimeError: If API call fails or response is invalid
             json.JSONDecodeError: If response is not valid JSON
         """
-        # Get API key from config or environment variable
-        api_key = config.get('api_key')
-        api_key_env = config.get('api_key_env')
+        client = self._get_client(config)
         
-        if api_key_env:
-            api_key = os.environ.get(api_key_env)
+        # Model parameters
+        model_params = self._get_model_parameters(config)
+        
+        # Deterministic sampling returns the same answer for the same prompt
+        cache_key = self._prompt_cache_key(model_params, prompt)
+        if cache_key is not None:
+            cached = self._prompt_cache.get(cache_key)
+            if cached is not None:
+                return self._cache_hit_response(cached, prompt)
+        
+        try:
+            # Measure response time
+            start_time = time.perf_counter_ns()
             
-        if not api_key:
-            raise ValueError(f"API key not found for LLM configuration. Please check your models.yaml file or environment variables.")
+            if config.get('stream', False):
+                content, usage = self._stream_openai(client, prompt, model_params)
+                response_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
+                result = _extract_classification(content)
+                response_metrics = self._response_metrics(prompt, content, usage, response_time_ms, model_params)
+            else:
+                response = client.chat.completions.create(**self._build_request(prompt, model_params))
+                
+                # Calculate response time in milliseconds
+                response_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
+                
+                result, response_metrics = self._parse_response(prompt, response, response_time_ms, model_params)
+            
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
         
-        openai.api_key = api_key
-        openai.base_url = config.get('base_url', "https://api.openai.com/v1")
+        if cache_key is not None:
+            self._prompt_cache.put(cache_key, result, response_metrics)
+        return result, response_metrics
+    
+    def _stream_openai(self,
+                       client: openai.OpenAI,
+                       prompt: str,
+                       model_params: Dict[str, Any]) -> Tuple[str, Dict[str, Optional[int]]]:
+        """Stream a chat completion and stop once the classification JSON is complete.
         
-        # Model parameters
-        model_params = {
-            'model': config['model'],
-            'temperature': config.get('temperature', 0.0),
-            'max_tokens': config.get('max_tokens', 2000),
-            'top_p': config.get('top_p', 1.0)
+        Any text the model would generate after the JSON object is never produced,
+        which saves its generation time and completion tokens.
+        
+        Args:
+            client: OpenAI client to send the request with
+            prompt: Formatted prompt
+            model_params: Model parameters from _get_model_parameters
+            
+        Returns:
+            Tuple of the received message content and token usage. Usage reported by
+            the API is only available if the stream ran to completion; otherwise the
+            counts are estimated with get_token_counts.
+        """
+        stream = client.chat.completions.create(
+            **self._build_request(prompt, model_params),
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        pieces = []
+        usage = None
+        try:
+            for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                delta = chunk.choices[0].delta.content
+                pieces.append(delta)
+                # The object can only have closed in a chunk that contains a brace
+                if '}' in delta:
+                    try:
+                        _extract_classification("".join(pieces))
+                        break
+                    except RuntimeError:
+                        pass
+        finally:
+            stream.close()
+        
+        content = "".join(pieces)
+        if usage is not None:
+            return content, {
+                'prompt_tokens': usage.prompt_tokens,
+                'completion_tokens': usage.completion_tokens,
+                'total_tokens': usage.total_tokens
+            }
+        prompt_tokens = self.get_token_counts(prompt, model_params['model'])['estimated_tokens']
+        completion_tokens = self.get_token_counts(content, model_params['model'])['estimated_tokens']
+        return content, {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
         }
+    
+    async def _classify_with_openai_async(self,
+                                          client: openai.AsyncOpenAI,
+                                          prompt: str,
+                                          config: Dict[str, Any],
+                                          semaphore: asyncio.Semaphore) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Classify using the asynchronous OpenAI client.
+        
+        Only the request itself holds the semaphore; the response is parsed after
+        releasing it, so the next request is already in flight while this one is parsed.
+        
+        Args:
+            client: AsyncOpenAI client to send the request with
+            prompt: Formatted prompt
+            config: OpenAI configuration dictionary
+            semaphore: Semaphore limiting the number of requests in flight
+            
+        Returns:
+            Same as _classify_with_openai
+            
+        Raises:
+            RuntimeError: If API call fails or response is invalid
+        """
+        model_params = self._get_model_parameters(config)
+        
+        cache_key = self._prompt_cache_key(model_params, prompt)
+        if cache_key is not None:
+            cached = self._prompt_cache.get(cache_key)
+            if cached is not None:
+                return self._cache_hit_response(cached, prompt)
         
         try:
             # Measure response time
-            start_time = time.time()
-            
-            response = openai.chat.completions.create(
-                model=model_params['model'],
-                messages=[
-                    {"role": "system", "content": "You are a code review assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=model_params['temperature'],
-                max_tokens=model_params['max_tokens'],
-                top_p=model_params['top_p']
-            )
+            start_time = time.perf_counter_ns()
+            
+            async with semaphore:
+                response = await client.chat.completions.create(**self._build_request(prompt, model_params))
             
             # Calculate response time in milliseconds
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
             
-            # Extract content
-            content = response.choices[0].message.content
+            result, response_metrics = self._parse_response(prompt, response, response_time_ms, model_params)
             
-            # Get token usage from response
-            usage = {}
-            if hasattr(response, 'usage'):
-                usage = {
-                    'prompt_tokens': response.usage.prompt_tokens,
-                    'completion_tokens': response.usage.completion_tokens,
-                    'total_tokens': response.usage.total_tokens
-                }
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+        
+        if cache_key is not None:
+            self._prompt_cache.put(cache_key, result, response_metrics)
+        return result, response_metrics
+    
+    def _build_request(self, prompt: str, model_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion request body for a prompt.
+        
+        Args:
+            prompt: Formatted prompt
+            model_params: Model parameters from _get_model_parameters
             
-            # Extract JSON from response
-            json_str = content.split("```json")[1].split("```")[0].strip()
+        Returns:
+            Keyword arguments for chat.completions.create
+        """
+        request = {
+            'model': model_params['model'],
+            'messages': [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': model_params['temperature'],
+            'max_tokens': model_params['max_tokens'],
+            'top_p': model_params['top_p']
+        }
+        # Routes requests sharing a prompt prefix to the same provider cache
+        if 'prompt_cache_key' in model_params:
+            request['prompt_cache_key'] = model_params['prompt_cache_key']
+        # Makes the model answer with a bare JSON object
+        if model_params.get('json_mode'):
+            request['response_format'] = {"type": "json_object"}
+        return request
+    
+    def _parse_response(self,
+                        prompt: str,
+                        response: Any,
+                        response_time_ms: Optional[int],
+                        model_params: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Extract the classification and response metrics from a chat completion.
+        
+        Args:
+            prompt: Formatted prompt that was sent
+            response: Chat completion returned by the OpenAI client
+            response_time_ms: Time taken by the request in milliseconds, or None if unknown
+            model_params: Model parameters used for the request
             
-            try:
-                result = json.loads(json_str)
-                if not isinstance(result, dict) or "classification" not in result or "explanation" not in result:
-                    raise ValueError("Invalid JSON structure")
-                    
-                # Validate classification value
-                valid_classifications = ["false positive", "need fixing", "very serious"]
-                if result["classification"] not in valid_classifications:
-                    raise ValueError(f"Invalid classification value: {result['classification']}")
-                
-                # Prepare response metrics
-                response_metrics = {
-                    'full_prompt': prompt,
-                    'full_response': content,
-                    'prompt_tokens': usage.get('prompt_tokens'),
-                    'completion_tokens': usage.get('completion_tokens'),
-                    'total_tokens': usage.get('total_tokens'),
-                    'response_time_ms': response_time_ms,
-                    'model_parameters': model_params
-                }
-                
-                return result, response_metrics
-                
-            except json.JSONDecodeError as e:
-                raise RuntimeError(f"Invalid JSON response from LLM: {str(e)}")
-            except ValueError as e:
-                raise RuntimeError(f"Invalid response structure: {str(e)}")
+        Returns:
+            Tuple containing:
+              - Dictionary with classification and explanation
+              - Dictionary with response metrics (tokens, time, etc.)
             
-        except Exception as e:
-            raise RuntimeError(f"OpenAI API error: {str(e)}")
+        Raises:
+            RuntimeError: If the response is not valid JSON or has an invalid structure
+        """
+        # Extract content
+        content = response.choices[0].message.content
+        
+        # Get token usage from response
+        usage = {}
+        if getattr(response, 'usage', None) is not None:
+            prompt_details = getattr(response.usage, 'prompt_tokens_details', None)
+            usage = {
+                'prompt_tokens': response.usage.prompt_tokens,
+                'completion_tokens': response.usage.completion_tokens,
+                'total_tokens': response.usage.total_tokens,
+                # Prompt tokens served from the provider's prefix cache
+                'cached_tokens': getattr(prompt_details, 'cached_tokens', None)
+            }
+        
+        result = _extract_classification(content)
+        
+        return result, self._response_metrics(prompt, content, usage, response_time_ms, model_params)
+    
+    def _response_metrics(self,
+                          prompt: str,
+                          content: str,
+                          usage: Dict[str, Optional[int]],
+                          response_time_ms: Optional[int],
+                          model_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the response metrics dictionary returned alongside a classification.
+        
+        Args:
+            prompt: Formatted prompt that was sent
+            content: Message content returned by the LLM
+            usage: Token counts for the request (any of them may be missing)
+            response_time_ms: Time taken by the request in milliseconds, or None if unknown
+            model_params: Model parameters used for the request
+            
+        Returns:
+            Dictionary with response metrics (tokens, time, etc.)
+        """
+        return {
+            'full_prompt': prompt,
+            'full_response': content,
+            'prompt_tokens': usage.get('prompt_tokens'),
+            'completion_tokens': usage.get('completion_tokens'),
+            'total_tokens': usage.get('total_tokens'),
+            'cached_tokens': usage.get('cached_tokens'),
+            'response_time_ms': response_time_ms,
+            'model_parameters': model_params
+        }
             
     def get_token_counts(self, text: str, model: str) -> Dict[str, int]:
         """Estimate token counts for a given text and model.
         
         This is a fallback method when the API doesn't return token counts.
-        For OpenAI, a rough estimate is 1 token ~= 4 chars for English text.
+        Uses the model's tiktoken encoding when available; otherwise a rough
+        estimate of 1 token ~= 4 chars for English text. Counts are memoized
+        per (text, model).
         
         Args:
             text: Text to count tokens for
@@ -286,9 +1287,6 @@ class LLMService:
         Returns:
             Dictionary with estimated token count
         """
-        # Very rough estimate for English text
-        estimated_tokens = len(text) // 4
-        
         return {
-            'estimated_tokens': estimated_tokens
+            'estimated_tokens': _count_tokens(text, model)
         } 
\ No newline at end of file
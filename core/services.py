@@ -0,0 +1,98 @@
+"""
+Shared service instances for the Streamlit pages.
+
+Streamlit re-runs a page script on every interaction. Services obtained from this
+module are kept with st.cache_resource, so their parsed configuration, template
+caches, pooled HTTP clients and source file indexes survive reruns instead of
+being rebuilt each time.
+"""
+
+import os
+import streamlit as st
+from typing import Optional, Tuple
+
+import config
+from core.context_builder import ContextBuilder
+from core.llm_service import LLMService
+
+def _source_signature(config_path: str, prompts_dir: str = config.PROMPTS_DIR_PATH) -> Tuple:
+    """
+    Describe the files an LLMService reads when it is created.
+
+    Args:
+        config_path (str): Path to the LLM configuration file.
+        prompts_dir (str): Directory holding the prompt templates.
+
+    Returns:
+        Tuple: The (mtime, size) of the configuration file and the name and mtime of
+        every prompt template, so any edit yields a different signature.
+    """
+    def stat_key(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    try:
+        templates = tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in os.scandir(prompts_dir)
+            if entry.name.endswith(".txt")
+        ))
+    except OSError:
+        templates = ()
+
+    return (stat_key(config_path), templates)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _create_llm_service(config_path: str, signature: Tuple) -> LLMService:
+    """
+    Create the LLMService shared for a configuration file and source signature.
+
+    Args:
+        config_path (str): Path to the LLM configuration file.
+        signature (Tuple): Result of _source_signature, part of the cache key only.
+
+    Returns:
+        LLMService: A new service instance.
+    """
+    return LLMService(config_path)
+
+def get_llm_service(config_path: str = "models.yaml") -> LLMService:
+    """
+    Get the LLMService shared across Streamlit reruns and sessions.
+
+    A new service is created when the configuration file or a prompt template
+    changes; otherwise the cached instance is returned.
+
+    Args:
+        config_path (str): Path to the LLM configuration file.
+
+    Returns:
+        LLMService: The shared service instance.
+
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist.
+        yaml.YAMLError: If the configuration YAML is invalid.
+        ValueError: If a configuration entry is invalid.
+    """
+    return _create_llm_service(config_path, _source_signature(config_path))
+
+@st.cache_resource(show_spinner=False)
+def get_context_builder(project_root: str) -> ContextBuilder:
+    """
+    Get the ContextBuilder shared across Streamlit reruns and sessions.
+
+    The builder checks each source file's modification time before reusing a
+    cached context or file, so edits to the analyzed project are picked up. The
+    index used to resolve #include paths is built once, so headers added later
+    are only found by a new builder.
+
+    Args:
+        project_root (str): Path to the root of the analyzed project.
+
+    Returns:
+        ContextBuilder: The shared builder for the project root.
+    """
+    return ContextBuilder(project_root)
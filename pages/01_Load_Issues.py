@@ -10,14 +10,16 @@ The page also displays statistics about existing issues in the database.
 
 import os
 import io
+import stat
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from core.issue_parser import parse_cppcheck_csv
-from core.data_manager import add_issues, get_all_issues, get_issue_count, get_issue_counts_by_status, get_issue_counts_by_severity
+from core.issue_parser import iter_cppcheck_csv_chunks, parse_cppcheck_csv_head
+from core.data_manager import add_issues, get_db_connection, get_issues_filtered, get_issue_count, get_issue_counts_by_status, get_issue_counts_by_severity
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -36,55 +38,119 @@ st.markdown("Upload a cppcheck CSV file or provide a path to load issues into th
 # Define file upload tab and file path tab
 tab1, tab2 = st.tabs(["Upload CSV File", "Specify CSV Path"])
 
+# Number of issues shown per page of the "Show All Issues" list
+ISSUE_PAGE_SIZE = 500
+
+# Cached database readers so widget interactions don't re-query the database.
+# Writes on any page clear st.cache_data, and the TTL covers changes made elsewhere.
+@st.cache_data(ttl=30)
+def _cached_issue_count() -> int:
+    return get_issue_count()
+
+@st.cache_data(ttl=30)
+def _cached_counts_by_status() -> Dict[str, int]:
+    return get_issue_counts_by_status()
+
+@st.cache_data(ttl=30)
+def _cached_counts_by_severity() -> Dict[str, int]:
+    return get_issue_counts_by_severity()
+
+@st.cache_data(ttl=30)
+def _cached_issue_page_table(statuses: Tuple[str, ...], severities: Tuple[str, ...], before_id: Optional[int]) -> pa.Table:
+    # Built once per page so reruns hand st.dataframe an Arrow table without converting from pandas.
+    # One extra row tells whether a next page exists.
+    issues = get_issues_filtered(statuses, severities, limit=ISSUE_PAGE_SIZE + 1, before_id=before_id)
+    return pa.Table.from_pydict(
+        {name: [issue[field] for issue in issues] for field, name in EXISTING_COLUMNS.items()},
+        schema=EXISTING_SCHEMA
+    )
+
+def on_next_page_click(before_id: int) -> None:
+    """Show the page of issues older than before_id."""
+    st.session_state.issue_page_cursors.append(before_id)
+
+def on_previous_page_click() -> None:
+    """Return to the previous page of issues."""
+    st.session_state.issue_page_cursors.pop()
+
 # Get existing issues for reference
 try:
     logger.debug("Fetching existing issues count from database")
-    existing_count = get_issue_count()
+    existing_count = _cached_issue_count()
     logger.info(f"Found {existing_count} existing issues in database")
 except Exception as e:
     logger.error(f"Failed to load existing issues count: {str(e)}", exc_info=True)
     st.error(f"Error loading existing issues count: {str(e)}")
     existing_count = 0
 
+# Number of issues parsed and shown before the user confirms a load
+PREVIEW_COUNT = 10
+
+# Number of CSV lines parsed and inserted at a time when loading a file
+LOAD_CHUNK_SIZE = 50_000
+
+# Display names for the issue fields shown in the tables below
+PREVIEW_COLUMNS = {
+    'cppcheck_file': 'File',
+    'cppcheck_line': 'Line',
+    'cppcheck_severity': 'Severity',
+    'cppcheck_id': 'ID',
+    'cppcheck_summary': 'Summary'
+}
+EXISTING_COLUMNS = {
+    'id': 'ID',
+    'cppcheck_file': 'File',
+    'cppcheck_line': 'Line',
+    'cppcheck_severity': 'Severity',
+    'status': 'Status',
+    'created_at': 'Added'
+}
+EXISTING_SCHEMA = pa.schema([
+    ('ID', pa.int64()),
+    ('File', pa.string()),
+    ('Line', pa.int32()),
+    ('Severity', pa.dictionary(pa.int32(), pa.string())),
+    ('Status', pa.dictionary(pa.int32(), pa.string())),
+    ('Added', pa.string())
+])
+
 def parse_and_preview_issues(source: Any, is_file_path: bool = False) -> Optional[List[Dict[str, Any]]]:
-    """Parse issues from source and display a preview.
+    """Parse the first issues from source and display a preview.
+    
+    Only the preview rows are parsed here; the full file is parsed when the
+    user confirms loading it into the database.
     
     Args:
         source: Either a file-like object or a file path
         is_file_path: Whether the source is a file path
         
     Returns:
-        List of parsed issues or None if parsing failed
+        List of previewed issues or None if parsing failed
     """
     try:
         with st.spinner("Parsing issues..."):
-            logger.debug(f"Parsing issues from {'file path' if is_file_path else 'uploaded file'}")
-            issues = parse_cppcheck_csv(source)
+            logger.debug(f"Parsing preview from {'file path' if is_file_path else 'uploaded file'}")
+            preview_data = parse_cppcheck_csv_head(source, n=PREVIEW_COUNT)
             
-        if not issues:
+        if not preview_data:
             logger.warning("No issues found in the source")
             st.warning("No issues found in the source file.")
             return None
             
-        logger.info(f"Successfully parsed {len(issues)} issues")
-        st.success(f"Successfully parsed {len(issues)} issues.")
+        logger.info(f"Parsed {len(preview_data)} issues for preview")
         
         # Create DataFrame for display
-        preview_count = min(10, len(issues))
-        preview_data = issues[:preview_count] if preview_count < len(issues) else issues
-        
-        preview_df = pd.DataFrame([{
-            'File': issue['cppcheck_file'],
-            'Line': issue['cppcheck_line'],
-            'Severity': issue['cppcheck_severity'],
-            'ID': issue['cppcheck_id'],
-            'Summary': issue['cppcheck_summary'][:100] + ('...' if len(issue['cppcheck_summary']) > 100 else '')
-        } for issue in preview_data])
+        preview_df = pd.DataFrame.from_records(
+            preview_data,
+            columns=['cppcheck_file', 'cppcheck_line', 'cppcheck_severity', 'cppcheck_id', 'cppcheck_summary']
+        ).rename(columns=PREVIEW_COLUMNS)
+        summaries = preview_df['Summary']
+        preview_df['Summary'] = summaries.str.slice(0, 100) + summaries.str.len().gt(100).map({True: '...', False: ''})
         
-        st.subheader(f"Preview (first {preview_count} of {len(issues)} issues)")
-        st.dataframe(preview_df)
+        st.subheader(f"Preview (first {len(preview_data)} issues)")
+        st.dataframe(preview_df, hide_index=True)
         
-        return issues
+        return preview_data
         
     except Exception as e:
         logger.error(f"Error parsing CSV: {str(e)}", exc_info=True)
@@ -93,59 +159,74 @@ def parse_and_preview_issues(source: Any, is_file_path: bool = False) -> Optiona
         traceback.print_exc()
         return None
 
-def load_issues_to_database(issues: List[Dict[str, Any]]) -> None:
-    """Load parsed issues into the database.
+def load_issues_to_database(source: Any) -> None:
+    """Parse all issues from source and load them into the database.
+    
+    The file is parsed and inserted in chunks of LOAD_CHUNK_SIZE lines, so only
+    one chunk is held in memory at a time. All chunks are inserted in a single
+    transaction: if any chunk fails, none of the file's issues are kept, and
+    loading it again doesn't duplicate them.
     
     Args:
-        issues: List of parsed issues to add to the database
+        source: Either a file-like object or a file path
     """
+    added_count = 0
+    committed = False
     try:
-        with st.spinner("Adding issues to database..."):
-            logger.debug(f"Adding {len(issues)} issues to database")
-            new_ids = add_issues(issues)
-            logger.info(f"Successfully added {len(new_ids)} issues to database")
-            st.success(f"Successfully added {len(new_ids)} issues to the database.")
-            st.session_state['issues_loaded'] = True
-            
-            # Create button to navigate to Run LLM page
-            if st.button("Proceed to Run LLM"):
-                logger.debug("Navigating to Run LLM page")
-                st.switch_page("pages/02_Run_LLM.py")
+        progress_bar = st.progress(0.0, text="Adding issues to database...")
+        with get_db_connection() as conn:
+            for issues, fraction in iter_cppcheck_csv_chunks(source, chunksize=LOAD_CHUNK_SIZE):
+                logger.debug(f"Adding {len(issues)} issues to database")
+                added_count += len(add_issues(issues, conn=conn))
+                progress_bar.progress(fraction, text=f"Added {added_count} issues to database...")
+            conn.commit()
+            committed = True
+        
+        logger.info(f"Successfully added {added_count} issues to database")
+        st.success(f"Successfully added {added_count} issues to the database.")
+        st.session_state['issues_loaded'] = True
+        
+        # Create button to navigate to Run LLM page
+        if st.button("Proceed to Run LLM"):
+            logger.debug("Navigating to Run LLM page")
+            st.switch_page("pages/02_Run_LLM.py")
     except Exception as e:
-        logger.error(f"Error adding issues to database: {str(e)}", exc_info=True)
-        st.error(f"Error adding issues to database: {str(e)}")
+        logger.error(f"Error adding issues to database after parsing {added_count} issues: {str(e)}", exc_info=True)
+        st.error(f"Error adding issues to database: {str(e)} (no issues from this file were added)")
         import traceback
         traceback.print_exc()
+    finally:
+        if committed and added_count:
+            # Refresh the cached issue reads on every page
+            st.cache_data.clear()
 
 def on_parse_upload_click():
     """Callback for parsing uploaded file"""
     logger.debug("Parse and load button clicked for uploaded file")
     if uploaded_file is not None:
-        issues = parse_and_preview_issues(uploaded_file)
-        if issues:
-            st.session_state['upload_issues'] = issues
+        if parse_and_preview_issues(uploaded_file):
+            st.session_state['upload_source'] = uploaded_file
             st.button("Confirm and Load into Database", key="confirm_upload", on_click=on_confirm_upload_click)
 
 def on_confirm_upload_click():
     """Callback for confirming upload to database"""
     logger.debug("Confirm and load button clicked for uploaded file")
-    if 'upload_issues' in st.session_state:
-        load_issues_to_database(st.session_state['upload_issues'])
+    if 'upload_source' in st.session_state:
+        load_issues_to_database(st.session_state['upload_source'])
 
 def on_parse_path_click():
     """Callback for parsing file from path"""
     logger.debug(f"Parse and load button clicked for file path: {csv_path}")
     if os.path.isfile(csv_path):
-        issues = parse_and_preview_issues(csv_path, is_file_path=True)
-        if issues:
-            st.session_state['path_issues'] = issues
+        if parse_and_preview_issues(csv_path, is_file_path=True):
+            st.session_state['path_source'] = csv_path
             st.button("Confirm and Load into Database", key="confirm_path", on_click=on_confirm_path_click)
 
 def on_confirm_path_click():
     """Callback for confirming path-based issues to database"""
     logger.debug("Confirm and load button clicked for file path")
-    if 'path_issues' in st.session_state:
-        load_issues_to_database(st.session_state['path_issues'])
+    if 'path_source' in st.session_state:
+        load_issues_to_database(st.session_state['path_source'])
 
 # Tab 1: Upload CSV File
 with tab1:
@@ -168,10 +249,15 @@ with tab2:
                              help="Enter the absolute or relative path to the cppcheck CSV file")
     
     if csv_path:
-        # Verify file exists
-        if os.path.isfile(csv_path):
-            file_size_kb = round(os.path.getsize(csv_path) / 1024, 2)
-            file_mod_time = datetime.fromtimestamp(os.path.getmtime(csv_path))
+        # Verify file exists, with one stat call for the existence check, size and time
+        try:
+            file_stat = os.stat(csv_path)
+        except OSError:
+            file_stat = None
+        
+        if file_stat is not None and stat.S_ISREG(file_stat.st_mode):
+            file_size_kb = round(file_stat.st_size / 1024, 2)
+            file_mod_time = datetime.fromtimestamp(file_stat.st_mtime)
             
             logger.debug(f"File found: {os.path.basename(csv_path)} ({file_size_kb} KB, last modified: {file_mod_time})")
             st.info(f"File found: {os.path.basename(csv_path)} ({file_size_kb} KB, last modified: {file_mod_time})")
@@ -188,19 +274,12 @@ if existing_count > 0:
     logger.debug("Preparing to display existing issues summary")
     
     # Get status and severity counts directly from the database
-    status_counts_dict = get_issue_counts_by_status()
-    severity_counts_dict = get_issue_counts_by_severity()
+    status_counts_dict = _cached_counts_by_status()
+    severity_counts_dict = _cached_counts_by_severity()
     
     # Convert to DataFrame for display
-    status_counts_df = pd.DataFrame([
-        {"Status": status, "Count": count} 
-        for status, count in status_counts_dict.items()
-    ])
-    
-    severity_counts_df = pd.DataFrame([
-        {"Severity": severity, "Count": count} 
-        for severity, count in severity_counts_dict.items()
-    ])
+    status_counts_df = pd.DataFrame(list(status_counts_dict.items()), columns=["Status", "Count"])
+    severity_counts_df = pd.DataFrame(list(severity_counts_dict.items()), columns=["Severity", "Count"])
     
     logger.debug(f"Status counts: {status_counts_dict}")
     logger.debug(f"Severity counts: {severity_counts_dict}")
@@ -210,28 +289,16 @@ if existing_count > 0:
     
     with col1:
         st.subheader("Issues by Status")
-        st.dataframe(status_counts_df)
+        st.dataframe(status_counts_df, hide_index=True)
     
     with col2:
         st.subheader("Issues by Severity")
-        st.dataframe(severity_counts_df)
+        st.dataframe(severity_counts_df, hide_index=True)
     
-    # Display the full dataframe with filters
-    with st.expander("Show All Issues"):
-        # Get issues data for the dataframe
-        all_issues = get_all_issues()
-        
-        # Create a DataFrame for display
-        existing_df = pd.DataFrame([{
-            'ID': issue['id'],
-            'File': issue['cppcheck_file'],
-            'Line': issue['cppcheck_line'],
-            'Severity': issue['cppcheck_severity'],
-            'Status': issue['status'],
-            'Added': issue['created_at']
-        } for issue in all_issues])
-        
-        # Add filters
+    # Display the filtered issue list; the query only runs while it is shown
+    st.toggle("Show All Issues", key="show_all_expanded")
+    if st.session_state.get('show_all_expanded'):
+        # Read the filters first so they can be applied in SQL
         col1, col2 = st.columns(2)
         with col1:
             status_filter = st.multiselect("Filter by Status", 
@@ -242,15 +309,29 @@ if existing_count > 0:
                                             options=sorted(severity_counts_dict.keys()),
                                             default=[])
         
-        # Apply filters
-        filtered_df = existing_df
-        if status_filter:
-            logger.debug(f"Filtering by status: {status_filter}")
-            filtered_df = filtered_df[filtered_df['Status'].isin(status_filter)]
-        if severity_filter:
-            logger.debug(f"Filtering by severity: {severity_filter}")
-            filtered_df = filtered_df[filtered_df['Severity'].isin(severity_filter)]
+        logger.debug(f"Filtering by status: {status_filter}, severity: {severity_filter}")
+        
+        # Start again from the newest issues whenever the filters change
+        filter_key = (tuple(status_filter), tuple(severity_filter))
+        if st.session_state.get('issue_page_filters') != filter_key:
+            st.session_state.issue_page_filters = filter_key
+            st.session_state.issue_page_cursors = [None]
+        cursors = st.session_state.issue_page_cursors
+        
+        page_table = _cached_issue_page_table(*filter_key, cursors[-1])
+        has_next = page_table.num_rows > ISSUE_PAGE_SIZE
+        page_table = page_table.slice(0, ISSUE_PAGE_SIZE)
         
-        logger.debug(f"Displaying {len(filtered_df)} issues after filtering")
-        # Show dataframe
-        st.dataframe(filtered_df)
\ No newline at end of file
+        logger.debug(f"Displaying page {len(cursors)} with {page_table.num_rows} issues after filtering")
+        # Show table
+        st.dataframe(page_table, hide_index=True)
+        
+        col1, col2, col3 = st.columns([1, 1, 4])
+        with col1:
+            st.button("Previous", on_click=on_previous_page_click, disabled=len(cursors) == 1)
+        with col2:
+            st.button("Next", on_click=on_next_page_click,
+                      args=(page_table['ID'][-1].as_py() if page_table.num_rows else 0,),
+                      disabled=not has_next)
+        with col3:
+            st.caption(f"Page {len(cursors)}, newest issues first")
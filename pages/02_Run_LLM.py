@@ -14,17 +14,28 @@ import sys
 import time
 import json
 import yaml
+import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import streamlit as st
 import pandas as pd
-from typing import Dict, Any, List, Set, Optional, Callable
+import pyarrow as pa
+from typing import Dict, Any, List, Set, Optional, Callable, Tuple
 from datetime import datetime
 
+# C YAML loader, falling back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 import config
 from core.context_builder import ContextBuilder
-from core.llm_service import LLMService
+from core.llm_service import VALID_CLASSIFICATIONS
+from core.services import get_context_builder, get_llm_service
 from core.data_manager import (
     get_all_issues, 
-    get_issues_by_filters, 
+    get_issues_filtered, 
     add_llm_classification, 
     get_issue_by_id,
     get_all_issue_statuses,
@@ -40,40 +51,109 @@ st.set_page_config(
     layout="wide"
 )
 
+# Seconds between refreshes of the progress display while issues are processed
+PROGRESS_REFRESH_SECONDS = 1.0
+
+class ProcessingRun:
+    """
+    Progress and results of one processing run.
+    
+    The run is processed on a background thread and kept in st.session_state, so the
+    page can show its progress while the script stays responsive. Only the worker
+    thread updates the progress and results; the page sets stop_event to stop it.
+    """
+    
+    def __init__(self, total_issues: int):
+        self.total_issues = total_issues
+        self.current_issue_index = 0
+        self.processed_issues: List[Dict[str, Any]] = []
+        self.failed_issues: List[Dict[str, Any]] = []
+        self.stop_event = threading.Event()
+        self.stopped = False
+        self.finished = False
+
 # Initialize session state for progress tracking if not exists
-if 'processing_issues' not in st.session_state:
-    st.session_state.processing_issues = False
-if 'current_issue_index' not in st.session_state:
-    st.session_state.current_issue_index = 0
-if 'total_issues' not in st.session_state:
-    st.session_state.total_issues = 0
-if 'processed_issues' not in st.session_state:
-    st.session_state.processed_issues = []
-if 'failed_issues' not in st.session_state:
-    st.session_state.failed_issues = []
-
-# Initialize LLM service
+if 'processing_run' not in st.session_state:
+    st.session_state.processing_run = None
+
+# Get the LLM service shared across reruns
 try:
-    llm_service = LLMService()
+    llm_service = get_llm_service(config.MODELS_CONFIG_PATH)
 except Exception as e:
     st.error(f"Error initializing LLM service: {str(e)}")
     llm_service = None
 
+# Display names and types for the issue table
+ISSUE_COLUMNS = {
+    'id': 'ID',
+    'cppcheck_file': 'File',
+    'cppcheck_line': 'Line',
+    'cppcheck_severity': 'Severity',
+    'cppcheck_id': 'Issue ID',
+    'status': 'Status'
+}
+ISSUE_SCHEMA = pa.schema([
+    ('ID', pa.int64()),
+    ('File', pa.string()),
+    ('Line', pa.int32()),
+    ('Severity', pa.dictionary(pa.int32(), pa.string())),
+    ('Issue ID', pa.dictionary(pa.int32(), pa.string())),
+    ('Status', pa.dictionary(pa.int32(), pa.string()))
+])
+
+# Cached database readers so widget interactions don't re-query the database.
+# Writes on any page clear st.cache_data, and the TTL covers changes made elsewhere.
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_issue_statuses() -> Set[str]:
+    return get_all_issue_statuses()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_counts_by_status() -> Dict[str, int]:
+    return get_issue_counts_by_status()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_issues_by_status(statuses: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    return get_issues_filtered(statuses=statuses, limit=None)
+
+def _issue_table(issues: List[Dict[str, Any]]) -> pa.Table:
+    # Built as Arrow from the cached rows, so reruns don't build a DataFrame and convert it for display
+    return pa.Table.from_pydict(
+        {name: [issue[field] for issue in issues] for field, name in ISSUE_COLUMNS.items()},
+        schema=ISSUE_SCHEMA
+    )
+
 # Page title
 st.title("Run LLM Analysis")
 st.markdown("Select LLM model, prompt template, and context strategy to classify issues.")
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def _read_llm_configs(path: str, mtime: float) -> Dict[str, Dict[str, Any]]:
+    """Parse the LLM configuration file; mtime is part of the cache key only."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _list_prompt_files(path: str, mtime: float) -> List[str]:
+    """List the prompt template files in a directory; mtime is part of the cache key only."""
+    # DirEntry.is_file() uses the type from the directory read, without a stat per file
+    with os.scandir(path) as entries:
+        return [entry.name for entry in entries if entry.is_file() and entry.name.endswith('.txt')]
+
 # Function to load available LLM configurations
 def load_llm_configs() -> Dict[str, Dict[str, Any]]:
     """
     Load LLM configurations from models.yaml file.
     
+    The configurations are taken from the shared LLM service when it is available;
+    otherwise the file is parsed again only when its mtime changes.
+    
     Returns:
         Dict[str, Dict[str, Any]]: Dictionary of LLM configurations.
     """
     try:
-        with open(config.MODELS_CONFIG_PATH, 'r') as f:
-            return yaml.safe_load(f)
+        if llm_service:
+            return llm_service.llm_configs
+        return _read_llm_configs(config.MODELS_CONFIG_PATH, os.path.getmtime(config.MODELS_CONFIG_PATH))
     except Exception as e:
         st.error(f"Error loading LLM configurations: {str(e)}")
         return {}
@@ -92,158 +172,249 @@ def get_prompt_templates() -> List[str]:
         else:
             # Fallback to manual file listing if llm_service is not available
             if os.path.exists(config.PROMPTS_DIR_PATH):
-                return [f for f in os.listdir(config.PROMPTS_DIR_PATH) 
-                        if os.path.isfile(os.path.join(config.PROMPTS_DIR_PATH, f)) and f.endswith('.txt')]
+                return _list_prompt_files(config.PROMPTS_DIR_PATH, os.stat(config.PROMPTS_DIR_PATH).st_mtime)
             else:
                 return []
     except Exception as e:
         st.error(f"Error loading prompt templates: {str(e)}")
         return []
 
+def _build_issue_content(issue: Dict[str, Any],
+                         context_builder: ContextBuilder,
+                         context_strategy: str,
+                         context_lines: int) -> Dict[str, str]:
+    """
+    Build the prompt fields for an issue, including its code context.
+    
+    Args:
+        issue: Issue to build the content for
+        context_builder: Context builder for the project
+        context_strategy: Strategy for building code context
+        context_lines: Number of lines before and after the issue for fixed_lines
+        
+    Returns:
+        Dict[str, str]: Issue fields used to format the prompt.
+        
+    Raises:
+        ValueError: If the project root is not set, the file is outside it, or no context could be built
+    """
+    # Check if PROJECT_ROOT_DIR is set
+    if not config.PROJECT_ROOT_DIR:
+        raise ValueError("Project root directory not set. Please set the REVIEW_HELPER_PROJECT_ROOT environment variable.")
+    
+    # Get file path and line number
+    file_path = issue['cppcheck_file']
+    line_number = int(issue['cppcheck_line'])  # Ensure line_number is an integer
+    
+    # Build absolute path to source file
+    abs_file_path = os.path.join(config.PROJECT_ROOT_DIR, file_path)
+    
+    # Validate path is safe (will be checked again in context_builder)
+    if not is_path_safe(abs_file_path, config.PROJECT_ROOT_DIR):
+        raise ValueError(f"File path is outside the project root: {file_path}")
+    
+    # Build code context using the selected strategy
+    code_context = context_builder.build_context(
+        abs_file_path, 
+        line_number, 
+        strategy=context_strategy,
+        lines_before=context_lines,
+        lines_after=context_lines,
+    )
+    
+    if code_context is None:
+        raise ValueError(f"Could not build code context for {file_path}:{line_number}. File may not exist or is not accessible.")
+    
+    # Prepare issue content for LLM
+    return {
+        'file': file_path,
+        'line': str(line_number),  # Ensure line is a string for formatting
+        'severity': issue['cppcheck_severity'],
+        'id': issue['cppcheck_id'],
+        'summary': issue['cppcheck_summary'],
+        'code_context': code_context
+    }
+
+def _record_failure(run: ProcessingRun, issue: Dict[str, Any], error: Exception) -> None:
+    """Add an issue that could not be processed to the run's failed issues."""
+    run.failed_issues.append({
+        'id': issue.get('id', 'Unknown'),
+        'file': issue.get('cppcheck_file', 'Unknown'),
+        'line': issue.get('cppcheck_line', 'Unknown'),
+        'error': str(error)
+    })
+    traceback.print_exc()
+    print(f"Failed to process issue {issue.get('id', 'Unknown')}: {str(error)}")
+
 # Function to process issues with LLM
-def process_issues(issues: List[Dict[str, Any]], 
+def process_issues(run: ProcessingRun,
+                  issues: List[Dict[str, Any]], 
                   llm_config_name: str, 
                   prompt_template: str,
                   context_strategy: str,
-                  stop_event) -> None:
+                  context_lines: int,
+                  context_builder: ContextBuilder) -> None:
     """
     Process a list of issues with the selected LLM configuration.
     
+    Runs on a background thread started by on_start_processing_click and reports
+    through run only, since Streamlit elements and session state are not available
+    here. Code contexts are built file by file on this thread, while up to the
+    model's max_concurrency LLM requests run in a thread pool. Results are saved to
+    the database here as they complete.
+    
     Args:
+        run: Progress and results of this run; its stop_event stops processing
         issues: List of issues to process
         llm_config_name: Name of the LLM configuration to use
         prompt_template: Filename of the prompt template to use
         context_strategy: Strategy for building code context
-        stop_event: Flag to stop processing
+        context_lines: Number of lines before and after the issue for fixed_lines
+        context_builder: Context builder for the project
     """
     print(f"Processing {len(issues)} issues with {llm_config_name} and {prompt_template}")
     
-    # Initialize context builder once
-    context_builder = ContextBuilder(config.PROJECT_ROOT_DIR)
+    max_workers = llm_service.llm_configs.get(llm_config_name, {}).get(
+        'max_concurrency', config.DEFAULT_LLM_CONCURRENCY
+    )
     
-    st.session_state.total_issues = len(issues)
-    st.session_state.current_issue_index = 0
-    st.session_state.processed_issues = []
-    st.session_state.failed_issues = []
+    # Visit issues file by file so each source file is read while it is still cached
+    remaining = iter(sorted(issues, key=lambda issue: (issue['cppcheck_file'], int(issue['cppcheck_line']))))
+    pending = {}
     
-    for i, issue in enumerate(issues):
-        if stop_event():
-            st.warning("Processing stopped by user.")
-            break
-            
-        st.session_state.current_issue_index = i + 1
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                # Keep up to max_workers requests in flight
+                while len(pending) < max_workers and not run.stopped:
+                    if run.stop_event.is_set():
+                        print("Processing stopped by user.")
+                        run.stopped = True
+                        break
+                    issue = next(remaining, None)
+                    if issue is None:
+                        break
+                    try:
+                        issue_content = _build_issue_content(issue, context_builder, context_strategy, context_lines)
+                    except Exception as e:
+                        run.current_issue_index += 1
+                        _record_failure(run, issue, e)
+                        continue
+                    
+                    # Call LLM for classification - returns both result and response metrics
+                    future = executor.submit(
+                        llm_service.classify_issue,
+                        issue_content=issue_content,
+                        llm_name=llm_config_name,
+                        prompt_template=prompt_template
+                    )
+                    pending[future] = (issue, issue_content)
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    issue, issue_content = pending.pop(future)
+                    run.current_issue_index += 1
+                    
+                    try:
+                        llm_result, response_metrics = future.result()
+                        
+                        # Validate classification before saving to database
+                        classification = llm_result.get('classification', 'unknown')
+                        if classification not in VALID_CLASSIFICATIONS:
+                            print(f"Warning: Invalid classification '{classification}' from LLM. Using 'unknown' instead.")
+                            classification = "unknown"
+                        
+                        # Save classification and response details to database. A cache hit
+                        # reused an earlier answer, so it gets no llm_responses record of its own.
+                        response_details = {} if response_metrics.get('cache_hit') else {
+                            'full_prompt': response_metrics.get('full_prompt', ''),
+                            'full_response': response_metrics.get('full_response', ''),
+                            'prompt_tokens': response_metrics.get('prompt_tokens'),
+                            'completion_tokens': response_metrics.get('completion_tokens'),
+                            'total_tokens': response_metrics.get('total_tokens'),
+                            'response_time_ms': response_metrics.get('response_time_ms'),
+                            'model_parameters': response_metrics.get('model_parameters')
+                        }
+                        add_llm_classification(
+                            issue_id=issue['id'],
+                            llm_model_name=llm_config_name,
+                            context_strategy=context_strategy,
+                            prompt_template=prompt_template,
+                            source_code_context=issue_content['code_context'],
+                            classification=classification,
+                            explanation=llm_result.get('explanation', ''),
+                            **response_details
+                        )
+                        
+                        # Add to processed issues
+                        run.processed_issues.append({
+                            'id': issue['id'],
+                            'file': issue_content['file'],
+                            'line': int(issue_content['line']),
+                            'classification': classification
+                        })
+                        print(f"[{run.current_issue_index} / {len(issues)}] Processed issue {issue['id']} with classification {classification}")
+                        
+                    except Exception as e:
+                        _record_failure(run, issue, e)
+    finally:
+        # Issue statuses changed; refresh the cached reads on every page
+        st.cache_data.clear()
         
-        try:
-            # Check if PROJECT_ROOT_DIR is set
-            if not config.PROJECT_ROOT_DIR:
-                raise ValueError("Project root directory not set. Please set the REVIEW_HELPER_PROJECT_ROOT environment variable.")
-            
-            # Get file path and line number
-            file_path = issue['cppcheck_file']
-            line_number = int(issue['cppcheck_line'])  # Ensure line_number is an integer
-            
-            # Build absolute path to source file
-            abs_file_path = os.path.join(config.PROJECT_ROOT_DIR, file_path)
-            
-            # Validate path is safe (will be checked again in context_builder)
-            if not is_path_safe(abs_file_path, config.PROJECT_ROOT_DIR):
-                raise ValueError(f"File path is outside the project root: {file_path}")
-            
-            # Build code context using the selected strategy
-            code_context = context_builder.build_context(
-                abs_file_path, 
-                line_number, 
-                strategy=context_strategy,
-                lines_before=context_lines,
-                lines_after=context_lines,
-            )
-            
-            if code_context is None:
-                raise ValueError(f"Could not build code context for {file_path}:{line_number}. File may not exist or is not accessible.")
-            
-            # Prepare issue content for LLM
-            issue_content = {
-                'file': file_path,
-                'line': str(line_number),  # Ensure line is a string for formatting
-                'severity': issue['cppcheck_severity'],
-                'id': issue['cppcheck_id'],
-                'summary': issue['cppcheck_summary'],
-                'code_context': code_context
-            }
-            
-            # Call LLM for classification - now returns both result and response metrics
-            llm_result, response_metrics = llm_service.classify_issue(
-                issue_content=issue_content,
-                llm_name=llm_config_name,
-                prompt_template=prompt_template
-            )
-            
-            # Validate classification before saving to database
-            valid_classifications = ["false positive", "need fixing", "very serious"]
-            classification = llm_result.get('classification', 'unknown')
-            if classification not in valid_classifications:
-                print(f"Warning: Invalid classification '{classification}' from LLM. Using 'unknown' instead.")
-                classification = "unknown"
-            
-            # Save classification and response details to database
-            add_llm_classification(
-                issue_id=issue['id'],
-                llm_model_name=llm_config_name,
-                context_strategy=context_strategy,
-                prompt_template=prompt_template,
-                source_code_context=code_context,
-                classification=classification,
-                explanation=llm_result.get('explanation', ''),
-                full_prompt=response_metrics.get('full_prompt', ''),
-                full_response=response_metrics.get('full_response', ''),
-                prompt_tokens=response_metrics.get('prompt_tokens'),
-                completion_tokens=response_metrics.get('completion_tokens'),
-                total_tokens=response_metrics.get('total_tokens'),
-                response_time_ms=response_metrics.get('response_time_ms'),
-                model_parameters=response_metrics.get('model_parameters')
-            )
-            
-            # Add to processed issues
-            st.session_state.processed_issues.append({
-                'id': issue['id'],
-                'file': file_path,
-                'line': line_number,
-                'classification': classification
-            })
-            print(f"[{i+1} / {len(issues)}] Processed issue {issue['id']} with classification {classification}")
-            
-        except Exception as e:
-            # Add to failed issues
-            st.session_state.failed_issues.append({
-                'id': issue.get('id', 'Unknown'),
-                'file': issue.get('cppcheck_file', 'Unknown'),
-                'line': issue.get('cppcheck_line', 'Unknown'),
-                'error': str(e)
-            })
-            import traceback
-            traceback.print_exc()
-            print(f"Failed to process issue {issue.get('id', 'Unknown')}: {str(e)}")
-    
-    print(f"Processed {len(st.session_state.processed_issues)} issues")
-    print(f"Failed {len(st.session_state.failed_issues)} issues")
-            
-    st.session_state.processing_issues = False
+        print(f"Processed {len(run.processed_issues)} issues")
+        print(f"Failed {len(run.failed_issues)} issues")
+        
+        run.finished = True
 
 def on_start_processing_click():
-    """Callback for starting processing"""
-    st.session_state.processing_issues = True
-    # Create stop event flag
-    stop_requested = lambda: not st.session_state.processing_issues
+    """Callback for starting processing on a background thread"""
+    run = ProcessingRun(len(selected_issues))
+    st.session_state.processing_run = run
     
-    # Start processing in a separate thread
-    st.session_state.total_issues = len(selected_issues)
-    process_issues(
-        selected_issues,
-        selected_llm,
-        selected_prompt,
-        selected_strategy,
-        stop_requested
-    )
+    threading.Thread(
+        target=process_issues,
+        args=(
+            run,
+            selected_issues,
+            selected_llm,
+            selected_prompt,
+            selected_strategy,
+            context_lines,
+            get_context_builder(config.PROJECT_ROOT_DIR)
+        ),
+        daemon=True
+    ).start()
+
+@st.fragment(run_every=PROGRESS_REFRESH_SECONDS)
+def show_processing_progress(run: ProcessingRun) -> None:
+    """Show the progress of a run, refreshing until the background thread finishes."""
+    if run.finished:
+        # Rerun the whole page to show the summary
+        st.rerun()
+    
+    progress = run.current_issue_index / run.total_issues if run.total_issues > 0 else 0.0
+    st.progress(progress, text=f"Processing issue {run.current_issue_index} of {run.total_issues}")
+    
+    # Stop button
+    if st.button("Stop Processing", disabled=run.stop_event.is_set()):
+        run.stop_event.set()
+    if run.stop_event.is_set():
+        st.warning("Stopping after the requests in progress complete...")
+    
+    # Display processed issues in real-time
+    if run.processed_issues:
+        with st.expander(f"Processed Issues ({len(run.processed_issues)})"):
+            processed_df = pd.DataFrame(list(run.processed_issues))
+            st.dataframe(processed_df, hide_index=True)
+    
+    # Display failed issues in real-time
+    if run.failed_issues:
+        with st.expander(f"Failed Issues ({len(run.failed_issues)})"):
+            failed_df = pd.DataFrame(list(run.failed_issues))
+            st.dataframe(failed_df, hide_index=True)
 
 
 # Main UI layout
@@ -294,8 +465,12 @@ with col2:
     if st.button("Preview Prompt Template"):
         try:
             prompt_path = os.path.join(config.PROMPTS_DIR_PATH, selected_prompt)
-            with open(prompt_path, 'r') as f:
-                prompt_content = f.read()
+            if llm_service:
+                # Served from the service's mtime-validated template cache
+                prompt_content = llm_service.load_prompt_template(prompt_path)
+            else:
+                with open(prompt_path, 'r') as f:
+                    prompt_content = f.read()
             st.code(prompt_content, language="text")
         except Exception as e:
             st.error(f"Error reading prompt template: {str(e)}")
@@ -325,7 +500,7 @@ st.subheader("Select Issues to Process")
 # Load issues
 try:
     # Get available statuses directly from the database
-    status_options = list(get_all_issue_statuses())
+    status_options = list(_cached_issue_statuses())
     
     # Filter issues based on status
     status_filter = st.multiselect(
@@ -335,7 +510,7 @@ try:
     )
     
     # Get status counts to show how many issues are available
-    status_counts = get_issue_counts_by_status()
+    status_counts = _cached_counts_by_status()
     for status in status_filter:
         st.info(f"Available {status} issues: {status_counts.get(status, 0)}")
     
@@ -344,21 +519,13 @@ try:
         st.stop()
     
     # Get filtered issues
-    filtered_issues = get_issues_by_filters(statuses=set(status_filter) if status_filter else None)
+    filtered_issues = _cached_issues_by_status(tuple(sorted(status_filter)))
     
-    # Create DataFrame for display
     if filtered_issues:
-        issues_df = pd.DataFrame([{
-            'ID': issue['id'],
-            'File': issue['cppcheck_file'],
-            'Line': issue['cppcheck_line'],
-            'Severity': issue['cppcheck_severity'],
-            'Issue ID': issue['cppcheck_id'],
-            'Status': issue['status']
-        } for issue in filtered_issues])
+        issues_table = _issue_table(filtered_issues)
         
         # Display issues and allow selection
-        st.dataframe(issues_df)
+        st.dataframe(issues_table, hide_index=True)
         
         # Allow selecting all or specific issues
         selection_type = st.radio(
@@ -384,27 +551,30 @@ try:
             st.info(f"Selected {len(selected_issues)} issues for processing.")
             
         elif selection_type == "By Severity":
-            severity_options = list(set(issue['cppcheck_severity'] for issue in filtered_issues))
+            severity_options = sorted(issues_table['Severity'].unique().to_pylist())
             selected_severities = st.multiselect(
                 "Select Severities",
                 options=severity_options,
                 default=severity_options
             )
             
+            severity_set = set(selected_severities)
             selected_issues = [issue for issue in filtered_issues 
-                              if issue['cppcheck_severity'] in selected_severities]
+                              if issue['cppcheck_severity'] in severity_set]
             st.info(f"Selected {len(selected_issues)} issues with severity: {', '.join(selected_severities)}")
             
         elif selection_type == "Specific Issues":
-            issue_ids = st.multiselect(
+            issue_by_label = {
+                f"ID {issue['id']}: {issue['cppcheck_file']}:{issue['cppcheck_line']}": issue
+                for issue in filtered_issues
+            }
+            issue_labels = st.multiselect(
                 "Select Specific Issues",
-                options=[f"ID {issue['id']}: {issue['cppcheck_file']}:{issue['cppcheck_line']}" 
-                         for issue in filtered_issues],
+                options=list(issue_by_label),
                 default=[]
             )
             
-            selected_issue_ids = [int(id_str.split(':')[0].replace('ID ', '')) for id_str in issue_ids]
-            selected_issues = [issue for issue in filtered_issues if issue['id'] in selected_issue_ids]
+            selected_issues = [issue_by_label[label] for label in issue_labels]
             st.info(f"Selected {len(selected_issues)} specific issues.")
         
         # Apply the first N limit if enabled
@@ -417,32 +587,9 @@ try:
             st.info(f"Limited selection to first {len(selected_issues)} issues out of {original_count}.")
         
         # Process button
-        if st.session_state.processing_issues:
-            progress_bar = st.progress(0)
-            
-            # Display progress
-            if st.session_state.total_issues > 0:
-                progress = st.session_state.current_issue_index / st.session_state.total_issues
-                progress_bar.progress(progress)
-                
-                st.text(f"Processing issue {st.session_state.current_issue_index} of {st.session_state.total_issues}")
-                
-                # Stop button
-                if st.button("Stop Processing"):
-                    st.session_state.processing_issues = False
-                    st.warning("Stopping after current issue completes...")
-            
-            # Display processed issues in real-time
-            if st.session_state.processed_issues:
-                with st.expander(f"Processed Issues ({len(st.session_state.processed_issues)})"):
-                    processed_df = pd.DataFrame(st.session_state.processed_issues)
-                    st.dataframe(processed_df)
-            
-            # Display failed issues in real-time
-            if st.session_state.failed_issues:
-                with st.expander(f"Failed Issues ({len(st.session_state.failed_issues)})"):
-                    failed_df = pd.DataFrame(st.session_state.failed_issues)
-                    st.dataframe(failed_df)
+        run = st.session_state.processing_run
+        if run is not None and not run.finished:
+            show_processing_progress(run)
         
         elif selected_issues:
             col1, col2 = st.columns([1, 4])
@@ -454,14 +601,18 @@ try:
                 st.warning("This may take some time depending on the number of issues and LLM response time.")
         
         # If processing has completed, show summary and navigation button
-        if (not st.session_state.processing_issues and 
-            st.session_state.processed_issues and 
-            st.session_state.current_issue_index > 0):
+        if run is not None and run.finished and (run.processed_issues or run.failed_issues):
+            
+            if run.stopped:
+                st.warning("Processing stopped by user.")
             
-            st.success(f"Completed processing {len(st.session_state.processed_issues)} issues.")
+            if run.processed_issues:
+                st.success(f"Completed processing {len(run.processed_issues)} issues.")
             
-            if st.session_state.failed_issues:
-                st.error(f"Failed to process {len(st.session_state.failed_issues)} issues. See details in the 'Failed Issues' section.")
+            if run.failed_issues:
+                st.error(f"Failed to process {len(run.failed_issues)} issues.")
+                with st.expander(f"Failed Issues ({len(run.failed_issues)})"):
+                    st.dataframe(pd.DataFrame(run.failed_issues), hide_index=True)
             
             if st.button("Proceed to Review Issues"):
                 st.switch_page("pages/03_Review_Issues.py")
@@ -3,8 +3,8 @@ Review Issues Page - Allows users to review LLM classifications and provide feed
 """
 
 import streamlit as st
-import pandas as pd
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
 
 from core.data_manager import (
     get_issue_by_id,
@@ -13,7 +13,9 @@ from core.data_manager import (
     get_all_issue_statuses,
     get_all_issue_severities,
     get_all_issue_cppcheck_ids,
-    get_issues_by_filters
+    count_issues_by_filters,
+    get_issue_ids_by_filters,
+    get_issue_position_by_filters
 )
 
 # Page configuration
@@ -23,64 +25,133 @@ st.set_page_config(
     layout="wide"
 )
 
+# Number of issues fetched per page and listed in the "Jump to Issue" selectbox
+ISSUE_PAGE_SIZE = 50
+
+# Filter values as passed to the data manager: sorted statuses, severities and
+# cppcheck IDs, and the contradictory-only flag
+FilterKey = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], bool]
+
+def _mark_contradictory(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Flag whether the issue's LLM classifications disagree, once per load."""
+    issue['contradictory'] = len({c['classification'] for c in issue.get('llm_classifications', ())}) > 1
+    return issue
+
+# Issue reads are cached so navigating and filtering don't go back to the database.
+# Feedback on a classification clears only that issue's cached detail, while setting
+# the final classification clears st.cache_data since it changes the issue's status.
+# The TTL picks up changes from other sessions.
+# Only the matching count and the current page of IDs are read for a filter, and the
+# full issue only for the one being shown.
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_issue_count(filter_key: FilterKey) -> int:
+    return count_issues_by_filters(*filter_key)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_issue_page(filter_key: FilterKey, offset: int) -> List[Dict[str, Any]]:
+    return get_issue_ids_by_filters(*filter_key, limit=ISSUE_PAGE_SIZE, offset=offset)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_issue_position(filter_key: FilterKey, issue_id: int) -> Optional[int]:
+    return get_issue_position_by_filters(issue_id, *filter_key)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_status_options() -> Tuple[str, ...]:
+    return tuple(sorted(get_all_issue_statuses()))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_severity_options() -> Tuple[str, ...]:
+    return tuple(sorted(get_all_issue_severities()))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_cppcheck_id_options() -> Tuple[str, ...]:
+    return tuple(sorted(get_all_issue_cppcheck_ids()))
+
+# Bounded, since reviewing walks through many issues; keyed by ID alone because
+# updated_at doesn't change when an issue's classifications do
+@st.cache_data(ttl=60, max_entries=256, show_spinner=False)
+def _cached_issue_by_id(issue_id: int) -> Optional[Dict[str, Any]]:
+    issue = get_issue_by_id(issue_id)
+    return _mark_contradictory(issue) if issue else None
+
 # Page title
 st.title("Review Issues")
 st.markdown("Review LLM classifications and provide feedback.")
 
-# Session state for issue navigation
-if 'current_issue_index' not in st.session_state:
-    st.session_state.current_issue_index = 0
-if 'filter_settings' not in st.session_state:
-    st.session_state.filter_settings = {
-        'status': ['pending_review'],
-        'severity': [],
-        'id': None,
-        'cppcheck_id': [],
-        'show_contradictory': False
-    }
+# Session state for issue navigation; the current issue is kept by ID so that
+# changing the filters doesn't silently show whichever issue now has its position
+st.session_state.setdefault('current_issue_id', None)
+st.session_state.setdefault('filter_settings', {
+    'status': ['pending_review'],
+    'severity': [],
+    'id': None,
+    'cppcheck_id': [],
+    'show_contradictory': False
+})
+
+def on_select_position(filter_key: FilterKey, position: int) -> None:
+    """Show the issue at the given position among the filtered issues."""
+    page = _cached_issue_page(filter_key, position - position % ISSUE_PAGE_SIZE)
+    # The cached count can outlive the page; fall back to its last issue, or keep
+    # showing the current one if the page is gone
+    if page:
+        st.session_state.current_issue_id = page[min(position % ISSUE_PAGE_SIZE, len(page) - 1)]['id']
+
+def on_refresh_filter_options_click() -> None:
+    """Reload the filter options, e.g. after issues were loaded in another session."""
+    _cached_status_options.clear()
+    _cached_severity_options.clear()
+    _cached_cppcheck_id_options.clear()
+
+def on_go_to_issue_change(filter_key: FilterKey) -> None:
+    """Show the issue at the number entered in the sidebar."""
+    on_select_position(filter_key, st.session_state.go_to_issue_number - 1)
 
 # Filter sidebar
 with st.sidebar:
     st.subheader("Filter Issues")
     
     try:
-        # Get all the unique values for filter dropdowns from the database
-        status_options = list(get_all_issue_statuses())
+        # Get all the unique values for filter dropdowns; cached, as they rarely change
+        status_options = list(_cached_status_options())
         
-        # Status filter
+        # Status filter; saved selections no longer in the database are dropped
         selected_status = st.multiselect(
             "Issue Status",
             options=status_options,
-            default=st.session_state.filter_settings['status']
+            default=[s for s in st.session_state.filter_settings['status'] if s in status_options]
         )
         
-        # Get all severity values directly from the database
-        severity_options = list(get_all_issue_severities())
+        # Get all severity values from the database, sorted once per cache refresh
+        severity_options = list(_cached_severity_options())
         
         # Severity filter
         selected_severity = st.multiselect(
             "Issue Severity",
             options=severity_options,
-            default=st.session_state.filter_settings['severity']
+            default=[s for s in st.session_state.filter_settings['severity'] if s in severity_options]
         )
         
         # Specific issue ID filter
-        specific_issue = st.text_input(
+        specific_issue = st.number_input(
             "Specific Issue ID",
-            value=st.session_state.filter_settings['id'] if st.session_state.filter_settings['id'] else "",
-            help="Enter an issue ID to view only that issue"
+            min_value=0,
+            value=st.session_state.filter_settings['id'] or 0,
+            step=1,
+            format="%d",
+            help="Enter an issue ID to view only that issue (0 shows all matching issues)"
         )
         
-        specific_issue_id = int(specific_issue) if specific_issue and specific_issue.isdigit() else None
+        specific_issue_id = int(specific_issue) or None
         
-        # Get all cppcheck IDs directly from the database
-        cppcheck_ids = list(get_all_issue_cppcheck_ids())
+        # Get all cppcheck IDs
+        cppcheck_ids = list(_cached_cppcheck_id_options())
         
         # Select cppcheck IDs filter
         selected_cppcheck_ids = st.multiselect(
             "Select cppcheck IDs",
             options=cppcheck_ids,
-            default=st.session_state.filter_settings['cppcheck_id'] if isinstance(st.session_state.filter_settings['cppcheck_id'], list) else [],
+            default=[c for c in st.session_state.filter_settings['cppcheck_id'] or [] if c in cppcheck_ids],
             help="Select one or more cppcheck IDs (e.g., 'zerodiv', 'nullPointer') to filter issues"
         )
         
@@ -93,6 +164,9 @@ with st.sidebar:
             help="Show only issues that have contradicting LLM classifications"
         )
         
+        st.button("Refresh Filter Options", on_click=on_refresh_filter_options_click,
+                  help="Reload the statuses, severities and cppcheck IDs from the database")
+        
         # Update filter settings
         st.session_state.filter_settings = {
             'status': selected_status,
@@ -105,73 +179,101 @@ with st.sidebar:
         # Filter issues using the database-level filtering API
         if specific_issue_id is not None:
             # If specific issue ID is provided, get that issue directly
-            specific_issue_data = get_issue_by_id(specific_issue_id)
-            filtered_issues = [specific_issue_data] if specific_issue_data else []
+            filter_key = None
+            specific_issue_data = _cached_issue_by_id(specific_issue_id)
+            page_rows = [specific_issue_data] if specific_issue_data else []
+            issue_count = len(page_rows)
+            current_index = page_start = 0
         else:
-            # Otherwise, use the filtering API
-            filtered_issues = get_issues_by_filters(
-                statuses=set(selected_status) if selected_status else None,
-                severities=set(selected_severity) if selected_severity else None,
-                cppcheck_ids={specific_cppcheck_id_value} if specific_cppcheck_id_value else None,
-                contradictory_only=show_contradictory
+            # Otherwise, read the count and the page holding the current issue
+            filter_key = (
+                tuple(sorted(selected_status)),
+                tuple(sorted(selected_severity)),
+                tuple(sorted(selected_cppcheck_ids)),
+                show_contradictory
             )
+            issue_count = _cached_issue_count(filter_key)
+            
+            # Stay on the current issue if it still matches the filters, else start at the first
+            current_index = 0
+            if st.session_state.current_issue_id is not None:
+                current_index = _cached_issue_position(filter_key, st.session_state.current_issue_id) or 0
+            page_start = current_index - current_index % ISSUE_PAGE_SIZE
+            page_rows = _cached_issue_page(filter_key, page_start) if issue_count else []
+            
+            # The cached position can outlive the issue's page; fall back to the first issue
+            if current_index - page_start >= len(page_rows):
+                current_index = page_start = 0
+                page_rows = _cached_issue_page(filter_key, 0) if issue_count else []
+        
+        if page_rows:
+            st.session_state.current_issue_id = page_rows[current_index - page_start]['id']
         
         # Display filtered count
-        st.info(f"Found {len(filtered_issues)} issues matching filters")
+        st.info(f"Found {issue_count} issues matching filters")
         
         # Issue navigation
-        if filtered_issues:
+        if page_rows:
             st.subheader("Issue Navigation")
             
-            # Previous/Next buttons
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Previous Issue", key="prev_issue", disabled=st.session_state.current_issue_index <= 0):
-                    st.session_state.current_issue_index = max(0, st.session_state.current_issue_index - 1)
+            # The buttons and indicator are filled in below, once a jump has been applied
+            navigation = st.container()
             
-            with col2:
-                if st.button("Next Issue", key="next_issue", disabled=st.session_state.current_issue_index >= len(filtered_issues) - 1):
-                    st.session_state.current_issue_index = min(len(filtered_issues) - 1, st.session_state.current_issue_index + 1)
-            
-            # Current issue indicator
-            st.text(f"Viewing issue {st.session_state.current_issue_index + 1} of {len(filtered_issues)}")
-            
-            # Jump to issue selector
+            # Jump to issue selector; options are positions within the current page,
+            # so the selection is the index.
+            page_end = page_start + len(page_rows)
             jump_to = st.selectbox(
                 "Jump to Issue",
-                options=[f"ID {issue['id']}: {issue['cppcheck_file']}:{issue['cppcheck_line']}" 
-                         for issue in filtered_issues],
-                index=st.session_state.current_issue_index
+                options=range(page_start, page_end),
+                index=current_index - page_start,
+                format_func=lambda i: f"ID {page_rows[i - page_start]['id']}: {page_rows[i - page_start]['cppcheck_file']}:{page_rows[i - page_start]['cppcheck_line']}"
             )
             
-            # Update current issue index when jumping
-            if jump_to:
-                issue_index = [f"ID {issue['id']}: {issue['cppcheck_file']}:{issue['cppcheck_line']}" 
-                              for issue in filtered_issues].index(jump_to)
-                st.session_state.current_issue_index = issue_index
+            if issue_count > ISSUE_PAGE_SIZE:
+                st.caption(f"Listing issues {page_start + 1}-{page_end} of {issue_count}")
+                st.number_input(
+                    "Go to issue number",
+                    min_value=1,
+                    max_value=issue_count,
+                    step=1,
+                    key="go_to_issue_number",
+                    on_change=on_go_to_issue_change,
+                    args=(filter_key,)
+                )
+            
+            # Update the current issue when jumping
+            if jump_to is not None and jump_to != current_index:
+                current_index = jump_to
+                st.session_state.current_issue_id = page_rows[current_index - page_start]['id']
+            
+            has_previous_issue = current_index > 0
+            has_next_issue = current_index < issue_count - 1
+            
+            with navigation:
+                # Previous/Next buttons; crossing a page boundary loads the adjacent page
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.button("Previous Issue", key="prev_issue", disabled=not has_previous_issue,
+                              on_click=on_select_position, args=(filter_key, current_index - 1))
+                
+                with col2:
+                    st.button("Next Issue", key="next_issue", disabled=not has_next_issue,
+                              on_click=on_select_position, args=(filter_key, current_index + 1))
+                
+                # Current issue indicator
+                st.text(f"Viewing issue {current_index + 1} of {issue_count}")
     
     except Exception as e:
         st.error(f"Error loading issues: {str(e)}")
-        filtered_issues = []
+        page_rows = []
 
 # Main content - Display current issue
-if filtered_issues:
-    # Adjust current_issue_index if out of bounds
-    if st.session_state.current_issue_index >= len(filtered_issues):
-        st.session_state.current_issue_index = 0
-
-    # Get current issue
-    current_issue = filtered_issues[st.session_state.current_issue_index]
-    
-    # Get complete issue details with classifications if not already loaded
-    # (This ensures we have full details when using filtered_issues from get_issues_by_filters)
-    if 'llm_classifications' not in current_issue:
-        detailed_issue = get_issue_by_id(current_issue['id'])
-    else:
-        detailed_issue = current_issue
+if page_rows:
+    # The listed pages hold IDs only; read the full issue with its classifications
+    detailed_issue = _cached_issue_by_id(st.session_state.current_issue_id)
     
     if not detailed_issue:
-        st.error(f"Error retrieving detailed information for issue {current_issue['id']}")
+        st.error(f"Error retrieving detailed information for issue {st.session_state.current_issue_id}")
     else:
         # Display issue details
         st.subheader("Issue Details")
@@ -198,37 +300,36 @@ if filtered_issues:
         st.subheader("Issue Summary")
         st.markdown(f"**{detailed_issue['cppcheck_summary']}**")
         
+        classifications = detailed_issue.get('llm_classifications') or []
+        
         # Display code context from the most recent LLM classification
-        if 'llm_classifications' in detailed_issue and detailed_issue['llm_classifications']:
-            latest_classification = detailed_issue['llm_classifications'][0]  # Assume the first is the most recent
+        if classifications:
+            latest_classification = classifications[0]  # Assume the first is the most recent
             
             st.subheader("Code Context")
             st.code(latest_classification['source_code_context'], language="cpp")
             
             # If there are contradictory classifications, highlight this
-            if st.session_state.filter_settings.get('show_contradictory', False):
-                classifications = [cls['classification'] for cls in detailed_issue['llm_classifications']]
-                if len(set(classifications)) > 1:
-                    st.warning("⚠️ This issue has contradictory classifications from different LLM models")
-                    
-                    # Show a summary of the contradictions
-                    classification_counts = {}
-                    for cls in classifications:
-                        if cls in classification_counts:
-                            classification_counts[cls] += 1
-                        else:
-                            classification_counts[cls] = 1
-                    
-                    st.markdown("**Classification Distribution:**")
-                    for cls, count in classification_counts.items():
-                        st.markdown(f"- {cls}: {count} model(s)")
+            if st.session_state.filter_settings.get('show_contradictory', False) and detailed_issue['contradictory']:
+                st.warning("⚠️ This issue has contradictory classifications from different LLM models")
+                
+                # Show a summary of the contradictions
+                classification_counts = Counter(cls['classification'] for cls in classifications)
+                st.markdown("**Classification Distribution:**")
+                for cls, count in classification_counts.items():
+                    st.markdown(f"- {cls}: {count} model(s)")
         
         # Display LLM classifications
         st.subheader("LLM Classifications")
         
-        if 'llm_classifications' in detailed_issue and detailed_issue['llm_classifications']:
-            for i, classification in enumerate(detailed_issue['llm_classifications']):
-                with st.expander(f"Classification #{i+1} - {classification['llm_model_name']} - {classification['processing_timestamp']}"):
+        if classifications:
+            for i, classification in enumerate(classifications):
+                # Details and feedback widgets are only built for the classifications shown
+                if not st.toggle(f"Classification #{i+1} - {classification['llm_model_name']} - {classification['processing_timestamp']}",
+                                 key=f"show_classification_{classification['id']}"):
+                    continue
+                
+                with st.container(border=True):
                     # Classification details
                     st.markdown(f"**Model:** {classification['llm_model_name']}")
                     st.markdown(f"**Prompt Template:** {classification['prompt_template']}")
@@ -261,43 +362,47 @@ if filtered_issues:
                     
                     # Show feedback form if new or update requested
                     if not has_feedback or st.session_state.get(f"edit_fb_{classification['id']}", False):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            agrees = st.radio(
-                                "Do you agree with this classification?",
-                                options=["Agree", "Disagree"],
-                                index=0 if classification.get('user_agrees', True) else 1,
-                                key=f"agrees_{classification['id']}"
-                            )
-                        
-                        user_comment = st.text_area(
-                            "Comments (optional)",
-                            value=classification.get('user_comment', ''),
-                            key=f"comment_{classification['id']}"
-                        )
-                        
-                        if st.button("Submit Feedback", key=f"submit_{classification['id']}"):
-                            try:
-                                user_agrees = agrees == "Agree"
-                                update_successful = update_llm_classification_review(
-                                    classification_id=classification['id'],
-                                    user_agrees=user_agrees,
-                                    user_comment=user_comment if user_comment else None
+                        # A form so choosing and typing don't rerun the page until submitted
+                        with st.form(key=f"feedback_form_{classification['id']}"):
+                            col1, col2 = st.columns(2)
+                            
+                            with col1:
+                                agrees = st.radio(
+                                    "Do you agree with this classification?",
+                                    options=["Agree", "Disagree"],
+                                    index=0 if classification.get('user_agrees', True) else 1,
+                                    key=f"agrees_{classification['id']}"
                                 )
-                                
-                                if update_successful:
-                                    st.success("Feedback submitted successfully!")
-                                    # Remove edit state if it exists
-                                    if f"edit_fb_{classification['id']}" in st.session_state:
-                                        del st.session_state[f"edit_fb_{classification['id']}"]
+                            
+                            user_comment = st.text_area(
+                                "Comments (optional)",
+                                value=classification.get('user_comment', ''),
+                                key=f"comment_{classification['id']}"
+                            )
+                            
+                            if st.form_submit_button("Submit Feedback"):
+                                try:
+                                    user_agrees = agrees == "Agree"
+                                    update_successful = update_llm_classification_review(
+                                        classification_id=classification['id'],
+                                        user_agrees=user_agrees,
+                                        user_comment=user_comment if user_comment else None
+                                    )
                                     
-                                    # Refresh the page to show the updated feedback
-                                    st.experimental_rerun()
-                                else:
-                                    st.error("Failed to submit feedback. Please try again.")
-                            except Exception as e:
-                                st.error(f"Error submitting feedback: {str(e)}")
+                                    if update_successful:
+                                        st.success("Feedback submitted successfully!")
+                                        # Feedback only changes this issue's classifications,
+                                        # so only its cached detail is dropped
+                                        _cached_issue_by_id.clear(detailed_issue['id'])
+                                        # Remove edit state if it exists
+                                        st.session_state.pop(f"edit_fb_{classification['id']}", None)
+                                        
+                                        # Refresh the page to show the updated feedback
+                                        st.rerun()
+                                    else:
+                                        st.error("Failed to submit feedback. Please try again.")
+                                except Exception as e:
+                                    st.error(f"Error submitting feedback: {str(e)}")
         else:
             st.info("No LLM classifications found for this issue. Run LLM analysis first.")
         
@@ -341,13 +446,14 @@ if filtered_issues:
                         
                         if update_successful:
                             st.success("Final classification submitted successfully!")
+                            # The issue is now reviewed; refresh the cached issue reads on every page
+                            st.cache_data.clear()
                             
                             # Reset editing state
-                            if 'editing_final_classification' in st.session_state:
-                                del st.session_state['editing_final_classification']
+                            st.session_state.pop('editing_final_classification', None)
                             
                             # Refresh the page to show the updated classification
-                            st.experimental_rerun()
+                            st.rerun()
                         else:
                             st.error("Failed to submit classification. Please try again.")
                     except Exception as e:
@@ -358,14 +464,12 @@ if filtered_issues:
         col1, col2, col3 = st.columns([1, 2, 1])
         
         with col1:
-            if st.button("Previous", disabled=st.session_state.current_issue_index <= 0):
-                st.session_state.current_issue_index = max(0, st.session_state.current_issue_index - 1)
-                st.experimental_rerun()
+            st.button("Previous", disabled=not has_previous_issue,
+                      on_click=on_select_position, args=(filter_key, current_index - 1))
         
         with col3:
-            if st.button("Next", disabled=st.session_state.current_issue_index >= len(filtered_issues) - 1):
-                st.session_state.current_issue_index = min(len(filtered_issues) - 1, st.session_state.current_issue_index + 1)
-                st.experimental_rerun()
+            st.button("Next", disabled=not has_next_issue,
+                      on_click=on_select_position, args=(filter_key, current_index + 1))
 else:
     st.warning("No issues found matching the selected filters.")
     
@@ -23,7 +23,7 @@ from core.data_manager import (
     get_issue_counts_by_status,
     get_issue_counts_by_severity,
     get_issues_summary,
-    get_all_issues
+    get_issues_page
 )
 
 # Page configuration
@@ -84,7 +84,7 @@ try:
         if issues_summary['total'] > 0:
             try:
                 # Since we need date info, we'll get just a few issues to find the date range
-                sample_issues = get_all_issues()[:5]  # Just get a few issues to see date range
+                sample_issues = get_issues_page(limit=5)['items']  # Just get a few issues to see date range
                 # Try to parse dates from created_at
                 dates = [datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00')) 
                         for issue in sample_issues if 'created_at' in issue]
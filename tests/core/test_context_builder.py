@@ -139,6 +139,43 @@ Line 10"""
         
         self.assertEqual(context, expected)
     
+    def test_build_context_cached(self):
+        """Test that repeated context requests reuse the built context."""
+        first = self.context_builder.build_context(self.test_file_path, line_number=5, lines_before=1, lines_after=1)
+        
+        with patch('builtins.open', side_effect=AssertionError("file re-read")):
+            again = self.context_builder.build_context(self.test_file_path, line_number=5, lines_before=1, lines_after=1)
+        self.assertEqual(again, first)
+        
+        # Different options build a new context
+        wider = self.context_builder.build_context(self.test_file_path, line_number=5, lines_before=2, lines_after=2)
+        self.assertEqual(wider.split('\n')[0], "3: Line 3")
+    
+    def test_build_context_rebuilt_after_file_change(self):
+        """Test that a cached context is rebuilt when its file changes."""
+        first = self.context_builder.build_context(self.test_file_path, line_number=5, lines_before=0, lines_after=0)
+        self.assertEqual(first, "5: Line 5")
+        
+        with open(self.test_file_path, "w") as f:
+            f.write(self.test_file_content.replace("Line 5", "Line five"))
+        stat = os.stat(self.test_file_path)
+        os.utime(self.test_file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        again = self.context_builder.build_context(self.test_file_path, line_number=5, lines_before=0, lines_after=0)
+        self.assertEqual(again, "5: Line five")
+    
+    def test_build_context_reads_file_once(self):
+        """Test that contexts for several lines of a file share one read."""
+        with patch('builtins.open', wraps=open) as mock_open:
+            first = self.context_builder.build_context(self.test_file_path, line_number=2, lines_before=1, lines_after=1)
+            second = self.context_builder.build_context(self.test_file_path, line_number=9, lines_before=1, lines_after=1)
+            whole = self.context_builder.build_context(self.test_file_path, line_number=9, strategy="file_scope")
+        
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertEqual(first, "1: Line 1\n2: Line 2\n3: Line 3")
+        self.assertEqual(second, "8: Line 8\n9: Line 9\n10: Line 10")
+        self.assertEqual(len(whole.split('\n')), 10)
+    
     def test_build_context_file_scope(self):
         """Test building context with file_scope strategy."""
         context = self.context_builder.build_context(
@@ -271,6 +308,31 @@ std::string format_string(const std::string& input);
             os.remove(helper_path)
             os.rmdir(utils_dir)
             
+    def test_build_file_with_includes_context_after_header_change(self):
+        """Test that editing an included header changes the file_with_includes context."""
+        main_file_path = os.path.join(self.test_dir, "main.cpp")
+        header_path = os.path.join(self.test_dir, "myheader.h")
+        with open(main_file_path, "w") as f:
+            f.write('#include "myheader.h"\nint main() { return 0; }\n')
+        with open(header_path, "w") as f:
+            f.write("void old_name();\n")
+        
+        try:
+            first = self.context_builder.build_context(main_file_path, line_number=2, strategy="file_with_includes")
+            self.assertIn("old_name", first)
+            
+            with open(header_path, "w") as f:
+                f.write("void new_name();\n")
+            stat = os.stat(header_path)
+            os.utime(header_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            
+            again = self.context_builder.build_context(main_file_path, line_number=2, strategy="file_with_includes")
+            self.assertIn("new_name", again)
+            self.assertNotIn("old_name", again)
+        finally:
+            os.remove(main_file_path)
+            os.remove(header_path)
+    
     def test_find_includes(self):
         """Test the _find_includes method."""
         content = """#include <iostream>
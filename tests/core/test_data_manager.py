@@ -20,6 +20,28 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from core import data_manager
 
 
+def _make_issues(count, **overrides):
+    """
+    Build count valid cppcheck issues for add_issues.
+    
+    Each keyword overrides one issue field, either with a value or with a callable
+    that takes the issue's index and returns the value.
+    """
+    issues = []
+    for i in range(count):
+        issue = {
+            'cppcheck_file': f'src/file{i}.cpp',
+            'cppcheck_line': i,
+            'cppcheck_severity': 'error',
+            'cppcheck_id': 'nullPointer',
+            'cppcheck_summary': f'Issue {i}'
+        }
+        for field, value in overrides.items():
+            issue[field] = value(i) if callable(value) else value
+        issues.append(issue)
+    return issues
+
+
 class TestDataManager(unittest.TestCase):
     """Test class for data_manager module."""
     
@@ -36,6 +58,10 @@ class TestDataManager(unittest.TestCase):
                                     os.path.join(self.test_dir, 'test_issues.db'))
         self.db_path_mock = self.db_path_patcher.start()
         
+        # Force init_db to create the tables in the fresh database
+        self.db_initialized_patcher = patch('core.data_manager.DB_INITIALIZED', False)
+        self.db_initialized_patcher.start()
+        
         # Initialize the test database
         data_manager.init_db()
         
@@ -62,6 +88,7 @@ class TestDataManager(unittest.TestCase):
         # Stop the patchers
         self.db_dir_patcher.stop()
         self.db_path_patcher.stop()
+        self.db_initialized_patcher.stop()
         
         # Remove the temporary directory
         shutil.rmtree(self.test_dir)
@@ -96,6 +123,13 @@ class TestDataManager(unittest.TestCase):
                 WHERE type='trigger' AND name='update_issues_timestamp'
             """)
             self.assertIsNotNone(cursor.fetchone())
+            
+            # Check if the classifications index exists
+            cursor.execute("""
+                SELECT name FROM sqlite_master 
+                WHERE type='index' AND name='idx_llm_classifications_issue'
+            """)
+            self.assertIsNotNone(cursor.fetchone())
     
     def test_add_issues(self):
         """Test adding issues to the database."""
@@ -137,6 +171,39 @@ class TestDataManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             data_manager.add_issues([invalid_issue])
     
+    def test_add_issues_returns_ids_in_order(self):
+        """Test that bulk-inserted issues get the returned IDs, in input order."""
+        first_ids = data_manager.add_issues(_make_issues(3, cppcheck_summary=lambda i: f'first {i}'))
+        second_ids = data_manager.add_issues(_make_issues(2, cppcheck_summary=lambda i: f'second {i}'))
+        
+        self.assertEqual(data_manager.add_issues([]), [])
+        self.assertEqual(len(set(first_ids + second_ids)), 5)
+        self.assertEqual(data_manager.get_issue_by_id(first_ids[2])['cppcheck_summary'], 'first 2')
+        self.assertEqual(data_manager.get_issue_by_id(second_ids[0])['cppcheck_summary'], 'second 0')
+        
+        # An invalid issue anywhere in the list means nothing is inserted
+        invalid = _make_issues(2)
+        del invalid[1]['cppcheck_severity']
+        with self.assertRaises(ValueError):
+            data_manager.add_issues(invalid)
+        self.assertEqual(data_manager.get_issue_count(), 5)
+    
+    def test_add_issues_shared_connection(self):
+        """Test that issues added on a caller's connection form one transaction."""
+        # Nothing is kept when the transaction fails partway through
+        with self.assertRaises(RuntimeError):
+            with data_manager.get_db_connection() as conn:
+                data_manager.add_issues(_make_issues(3), conn=conn)
+                raise RuntimeError("load failed")
+        self.assertEqual(data_manager.get_issue_count(), 0)
+        
+        with data_manager.get_db_connection() as conn:
+            first_ids = data_manager.add_issues(_make_issues(3), conn=conn)
+            second_ids = data_manager.add_issues(_make_issues(2), conn=conn)
+            conn.commit()
+        self.assertEqual(second_ids[0], first_ids[-1] + 1)
+        self.assertEqual(data_manager.get_issue_count(), 5)
+    
     def test_get_issue_by_id(self):
         """Test retrieving an issue by ID."""
         # Add sample issues
@@ -188,6 +255,135 @@ class TestDataManager(unittest.TestCase):
         self.assertEqual(len(issues), 1)
         self.assertEqual(issues[0]['cppcheck_severity'], 'error')
     
+    def test_get_issues_page(self):
+        """Test retrieving issues one keyset page at a time."""
+        issue_ids = data_manager.add_issues(
+            _make_issues(5, cppcheck_severity=lambda i: 'error' if i % 2 else 'warning')
+        )
+        data_manager.add_llm_classification(
+            issue_id=issue_ids[-1],
+            llm_model_name='gpt-4',
+            context_strategy='fixed_lines',
+            prompt_template='template1',
+            source_code_context='code',
+            classification='false positive'
+        )
+        
+        # First page holds the newest issues
+        page = data_manager.get_issues_page(limit=2)
+        self.assertEqual([issue['id'] for issue in page['items']], issue_ids[:-3:-1])
+        self.assertEqual(page['next_before_id'], issue_ids[-2])
+        self.assertEqual(len(page['items'][0]['llm_classifications']), 1)
+        self.assertEqual(page['items'][1]['llm_classifications'], [])
+        
+        # Walking the remaining pages returns every issue exactly once
+        seen = [issue['id'] for issue in page['items']]
+        while page['items']:
+            page = data_manager.get_issues_page(limit=2, before_id=page['next_before_id'])
+            seen.extend(issue['id'] for issue in page['items'])
+        self.assertEqual(seen, issue_ids[::-1])
+        self.assertIsNone(page['next_before_id'])
+        
+        # Filters are applied before the page limit
+        page = data_manager.get_issues_page({'severity': 'error'}, limit=10)
+        self.assertEqual([issue['id'] for issue in page['items']], [issue_ids[3], issue_ids[1]])
+
+    def test_get_issues_filtered(self):
+        """Test retrieving issues filtered by several statuses and severities."""
+        issue_ids = data_manager.add_issues(
+            _make_issues(6, cppcheck_severity=lambda i: ('error', 'warning', 'style')[i % 3])
+        )
+        data_manager.set_issue_true_classification(issue_ids[0], 'false positive')
+
+        # No filters returns every issue, newest first, without classifications
+        result = data_manager.get_issues_filtered()
+        self.assertEqual([issue['id'] for issue in result], issue_ids[::-1])
+        self.assertNotIn('llm_classifications', result[0])
+
+        # Values within a filter are OR-ed, filters are AND-ed
+        result = data_manager.get_issues_filtered(severities=['error', 'style'])
+        self.assertEqual([issue['id'] for issue in result], [issue_ids[5], issue_ids[3], issue_ids[2], issue_ids[0]])
+        result = data_manager.get_issues_filtered(statuses=['pending_llm'], severities=['error'])
+        self.assertEqual([issue['id'] for issue in result], [issue_ids[3]])
+
+        # The limit keeps the newest matches
+        result = data_manager.get_issues_filtered(statuses=[], limit=2)
+        self.assertEqual([issue['id'] for issue in result], issue_ids[:-3:-1])
+        result = data_manager.get_issues_filtered(statuses=['pending_llm'], limit=None)
+        self.assertEqual([issue['id'] for issue in result], issue_ids[:0:-1])
+
+        # before_id continues after the previous page
+        result = data_manager.get_issues_filtered(limit=2, before_id=issue_ids[4])
+        self.assertEqual([issue['id'] for issue in result], [issue_ids[3], issue_ids[2]])
+
+    def test_get_issues_by_filters(self):
+        """Test retrieving filtered issues with their classifications attached."""
+        issue_ids = data_manager.add_issues(
+            _make_issues(4, cppcheck_severity=lambda i: 'error' if i % 2 else 'warning')
+        )
+        for issue_id, classifications in (
+            (issue_ids[1], ('false positive', 'need fixing')),
+            (issue_ids[2], ('false positive', 'false positive')),
+            (issue_ids[3], ('very serious',)),
+        ):
+            for classification in classifications:
+                data_manager.add_llm_classification(
+                    issue_id=issue_id,
+                    llm_model_name='gpt-4',
+                    context_strategy='fixed_lines',
+                    prompt_template='template1',
+                    source_code_context='code',
+                    classification=classification
+                )
+        
+        result = data_manager.get_issues_by_filters()
+        self.assertEqual([issue['id'] for issue in result], issue_ids[::-1])
+        self.assertEqual([len(issue['llm_classifications']) for issue in result], [1, 2, 2, 0])
+        self.assertTrue(all(
+            c['issue_id'] == issue['id'] for issue in result for c in issue['llm_classifications']
+        ))
+        
+        result = data_manager.get_issues_by_filters(severities={'error'})
+        self.assertEqual([issue['id'] for issue in result], [issue_ids[3], issue_ids[1]])
+        
+        # Only issues whose classifications disagree are contradictory
+        result = data_manager.get_issues_by_filters(contradictory_only=True)
+        self.assertEqual([issue['id'] for issue in result], [issue_ids[1]])
+    
+    def test_paged_issue_ids_by_filters(self):
+        """Test counting, paging and locating issues with the Review Issues filters."""
+        issue_ids = data_manager.add_issues(
+            _make_issues(5, cppcheck_severity=lambda i: 'error' if i % 2 else 'warning')
+        )
+        for classification in ('false positive', 'need fixing'):
+            data_manager.add_llm_classification(
+                issue_id=issue_ids[1],
+                llm_model_name='gpt-4',
+                context_strategy='fixed_lines',
+                prompt_template='template1',
+                source_code_context='code',
+                classification=classification
+            )
+        
+        self.assertEqual(data_manager.count_issues_by_filters(), 5)
+        self.assertEqual(data_manager.count_issues_by_filters(severities=['error']), 2)
+        self.assertEqual(data_manager.count_issues_by_filters(contradictory_only=True), 1)
+        
+        # Pages hold only the listed fields, newest first
+        page = data_manager.get_issue_ids_by_filters(limit=2, offset=2)
+        self.assertEqual(page, [
+            {'id': issue_ids[2], 'cppcheck_file': 'src/file2.cpp', 'cppcheck_line': 2},
+            {'id': issue_ids[1], 'cppcheck_file': 'src/file1.cpp', 'cppcheck_line': 1},
+        ])
+        page = data_manager.get_issue_ids_by_filters(severities=['warning'], limit=10)
+        self.assertEqual([issue['id'] for issue in page], [issue_ids[4], issue_ids[2], issue_ids[0]])
+        
+        self.assertEqual(data_manager.get_issue_position_by_filters(issue_ids[4]), 0)
+        self.assertEqual(data_manager.get_issue_position_by_filters(issue_ids[0]), 4)
+        self.assertEqual(data_manager.get_issue_position_by_filters(issue_ids[0], severities=['warning']), 2)
+        self.assertIsNone(data_manager.get_issue_position_by_filters(issue_ids[1], severities=['warning']))
+        self.assertIsNone(data_manager.get_issue_position_by_filters(999))
+    
     def test_add_llm_classification(self):
         """Test adding an LLM classification."""
         # Add sample issues
@@ -220,6 +416,53 @@ class TestDataManager(unittest.TestCase):
         self.assertEqual(classification['classification'], 'false positive')
         self.assertEqual(classification['explanation'], 'This is a false positive because the code is unreachable.')
     
+    def test_add_llm_classifications_bulk(self):
+        """Test adding several LLM classifications in one transaction."""
+        issue_ids = data_manager.add_issues([
+            {
+                'cppcheck_file': 'src/main.cpp',
+                'cppcheck_line': line,
+                'cppcheck_severity': 'warning',
+                'cppcheck_id': 'nullPointer',
+                'cppcheck_summary': 'Possible null pointer dereference: ptr'
+            }
+            for line in (42, 43)
+        ])
+        base_entry = {
+            'llm_model_name': 'gpt-4',
+            'context_strategy': 'fixed_lines',
+            'prompt_template': 'classification_default.txt',
+            'source_code_context': 'code',
+            'classification': 'need fixing'
+        }
+        
+        results = data_manager.add_llm_classifications_bulk([
+            dict(base_entry, issue_id=issue_ids[0]),
+            dict(base_entry, issue_id=issue_ids[1], full_prompt='prompt', full_response='response',
+                 total_tokens=10, model_parameters={'temperature': 0.0})
+        ])
+        
+        # Plain IDs without a response record, tuples with one
+        self.assertIsInstance(results[0], int)
+        classification_id, response_id = results[1]
+        responses = data_manager.get_llm_responses({'classification_id': classification_id})
+        self.assertEqual([r['id'] for r in responses], [response_id])
+        self.assertEqual(responses[0]['total_tokens'], 10)
+        
+        # Both issues moved to review
+        for issue_id in issue_ids:
+            issue = data_manager.get_issue_by_id(issue_id)
+            self.assertEqual(issue['status'], 'pending_review')
+            self.assertEqual(len(issue['llm_classifications']), 1)
+        
+        # An unknown issue rejects the whole batch
+        with self.assertRaises(ValueError):
+            data_manager.add_llm_classifications_bulk([
+                dict(base_entry, issue_id=issue_ids[0]),
+                dict(base_entry, issue_id=999)
+            ])
+        self.assertEqual(len(data_manager.get_issue_by_id(issue_ids[0])['llm_classifications']), 1)
+    
     def test_add_classification_nonexistent_issue(self):
         """Test adding a classification for a non-existent issue."""
         # Attempt to add a classification for a non-existent issue
@@ -385,6 +628,36 @@ class TestDataManager(unittest.TestCase):
         self.assertEqual(stats['classification_distribution']['false positive'], 1)
         self.assertEqual(stats['classification_distribution']['very serious'], 1)
     
+    def test_get_llm_statistics_group_totals(self):
+        """Test that grouped statistics count every classification in the group."""
+        issue_ids = data_manager.add_issues([
+            {
+                'cppcheck_file': 'src/main.cpp',
+                'cppcheck_line': line,
+                'cppcheck_severity': 'warning',
+                'cppcheck_id': 'nullPointer',
+                'cppcheck_summary': 'Possible null pointer dereference: ptr'
+            }
+            for line in (42, 43)
+        ])
+        for issue_id, classification in zip(issue_ids, ('false positive', 'need fixing')):
+            data_manager.add_llm_classification(
+                issue_id=issue_id,
+                llm_model_name='gpt-4',
+                context_strategy='fixed_lines',
+                prompt_template='template1',
+                source_code_context='code',
+                classification=classification
+            )
+            data_manager.set_issue_true_classification(issue_id=issue_id, classification='false positive')
+        
+        stats = data_manager.get_llm_statistics()
+        
+        self.assertEqual(stats['overall_accuracy'], {'total': 2, 'correct': 1, 'accuracy': 0.5})
+        for group in ('llm_models', 'context_strategies', 'prompt_templates'):
+            self.assertEqual(len(stats[group]), 1)
+            self.assertEqual(next(iter(stats[group].values())), {'total': 2, 'correct': 1, 'accuracy': 0.5})
+    
     def test_get_llm_statistics_with_filters(self):
         """Test retrieving LLM statistics with filters."""
         # Add sample issues and classifications as in the previous test
@@ -2,7 +2,7 @@
 
 import io
 import pytest
-from core.issue_parser import parse_cppcheck_csv, _validate_columns, _process_rows
+from core.issue_parser import parse_cppcheck_csv, parse_cppcheck_csv_head, iter_cppcheck_csv_chunks, _validate_columns, _process_rows
 
 # Test data
 VALID_CSV_CONTENT = """File,Line,Severity,Id,Summary
@@ -51,6 +51,52 @@ def test_parse_cppcheck_csv_from_buffer():
     assert issues[1]['Id'] == 'unusedFunction'
     assert issues[1]['Summary'] == "Function 'foo' is never used"
 
+def test_parse_cppcheck_csv_from_bytes_buffer_with_commas():
+    """Test that buffers are stream-decoded and summaries may contain commas."""
+    content = "File,Line,Severity,Id,Summary\r\ntest.cpp,10,error,nullPointer,Null pointer, maybe\r\n"
+    buffer = io.BytesIO(content.encode('utf-8'))
+    buffer.read()  # Parsing must not depend on the current position
+    
+    issues = parse_cppcheck_csv(buffer)
+    
+    assert len(issues) == 1
+    assert issues[0]['cppcheck_summary'] == 'Null pointer, maybe'
+    assert not buffer.closed
+    assert parse_cppcheck_csv(content.encode('utf-8')) == issues
+
+def test_parse_cppcheck_csv_head(tmp_path):
+    """Test that only the first n issues are parsed."""
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(MALFORMED_LINE_CSV + "\n" + VALID_CSV_CONTENT.split("\n", 1)[1])
+    
+    # The malformed first row is skipped and does not count towards n
+    issues = parse_cppcheck_csv_head(str(csv_file), n=2)
+    assert [issue['cppcheck_line'] for issue in issues] == [10, 20]
+    
+    buffer = io.BytesIO(VALID_CSV_CONTENT.encode('utf-8'))
+    assert parse_cppcheck_csv_head(buffer, n=10) == parse_cppcheck_csv(buffer)
+    
+    with pytest.raises(ValueError):
+        parse_cppcheck_csv_head(io.BytesIO(MISSING_COLUMN_CSV.encode('utf-8')))
+
+def test_iter_cppcheck_csv_chunks(tmp_path):
+    """Test parsing a CSV file in chunks with read progress."""
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(VALID_CSV_CONTENT + "\ntest.cpp,invalid,error,nullPointer,Skipped\n")
+    
+    chunks = list(iter_cppcheck_csv_chunks(str(csv_file), chunksize=2))
+    
+    # The last chunk only holds the malformed row, so it is not yielded
+    assert [[issue['cppcheck_line'] for issue in issues] for issues, _ in chunks] == [[10, 20], [30]]
+    fractions = [fraction for _, fraction in chunks]
+    assert fractions == sorted(fractions) and fractions[-1] <= 1.0
+    
+    buffer = io.BytesIO(VALID_CSV_CONTENT.encode('utf-8'))
+    chunks = list(iter_cppcheck_csv_chunks(buffer, chunksize=10))
+    assert [issues for issues, _ in chunks] == [parse_cppcheck_csv(buffer)]
+    assert chunks[0][1] == 1.0
+    assert not buffer.closed
+
 def test_parse_cppcheck_csv_missing_columns(tmp_path):
     """Test parsing a CSV file with missing required columns."""
     # Create a temporary CSV file with missing columns
@@ -105,15 +151,18 @@ def test_validate_columns():
 
 def test_process_rows():
     """Test the _process_rows helper function."""
-    import csv
-    
-    # Create a CSV reader with test data
-    reader = csv.DictReader(io.StringIO(VALID_CSV_CONTENT))
+    # Split the test data the same way parse_cppcheck_csv does
+    lines = VALID_CSV_CONTENT.splitlines()
+    fields = lines[0].split(',')
+    rows = [line.split(',', maxsplit=len(fields) - 1) for line in lines[1:]]
+    rows.append(['short.cpp', '40'])  # Too few columns, should be skipped
+    col_idx = {name: fields.index(name) for name in fields}
     
     # Process the rows
-    issues = _process_rows(reader)
+    issues = _process_rows(rows, col_idx)
     
     # Verify results
     assert len(issues) == 3
-    assert all(isinstance(issue['Line'], int) for issue in issues)
-    assert all(required in issue for issue in issues for required in ['File', 'Line', 'Severity', 'Id', 'Summary']) 
\ No newline at end of file
+    assert all(isinstance(issue['cppcheck_line'], int) for issue in issues)
+    assert all(required in issue for issue in issues
+               for required in ['cppcheck_file', 'cppcheck_line', 'cppcheck_severity', 'cppcheck_id', 'cppcheck_summary'])
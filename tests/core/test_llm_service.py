@@ -3,9 +3,9 @@
 import os
 import json
 import pytest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch, mock_open, MagicMock, AsyncMock
 import yaml
-from core.llm_service import LLMService
+from core.llm_service import LLMService, _compile_template, _count_tokens
 
 # Test data
 SAMPLE_CONFIG = """
@@ -180,4 +180,363 @@ def test_classify_issue_api_error(mock_create, llm_service):
             "gpt4",
             SAMPLE_PROMPT
         )
-    assert "OpenAI API error" in str(exc_info.value) 
\ No newline at end of file
+    assert "OpenAI API error" in str(exc_info.value) 
+
+def _make_completion(content):
+    """Build a minimal chat completion object with the given message content."""
+    completion = MagicMock()
+    completion.choices = [MagicMock()]
+    completion.choices[0].message.content = content
+    completion.usage.prompt_tokens = 10
+    completion.usage.completion_tokens = 5
+    completion.usage.total_tokens = 15
+    return completion
+
+def test_classify_batch(llm_service):
+    """Test concurrent classification returns results and errors in input order."""
+    good = _make_completion('```json\n{"classification": "need fixing", "explanation": "x"}\n```')
+    client = MagicMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+    client.chat.completions.create = AsyncMock(side_effect=[good, Exception("API Error")])
+    
+    with patch("openai.AsyncOpenAI", return_value=client), \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT):
+        results = llm_service.classify_batch(
+            [SAMPLE_ISSUE, dict(SAMPLE_ISSUE, summary="Uninitialized variable: x")],
+            "gpt4",
+            "dummy_template.txt"
+        )
+    
+    assert len(results) == 2
+    result, metrics = results[0]
+    assert result["classification"] == "need fixing"
+    assert metrics["total_tokens"] == 15
+    assert isinstance(results[1], RuntimeError)
+
+def test_classify_issue_issue_cache(llm_service):
+    """Test that a recurring issue at another location is answered from the issue cache."""
+    llm_service.llm_configs["gpt4"]["issue_cache"] = True
+    completion = _make_completion('```json\n{"classification": "false positive", "explanation": "x"}\n```')
+    moved_issue = dict(SAMPLE_ISSUE, file="src/other.cpp", line="7")
+    
+    with patch("openai.OpenAI") as mock_client, \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT):
+        mock_create = mock_client.return_value.chat.completions.create
+        mock_create.return_value = completion
+        first, first_metrics = llm_service.classify_issue(SAMPLE_ISSUE, "gpt4", "dummy_template.txt")
+        second, second_metrics = llm_service.classify_issue(moved_issue, "gpt4", "dummy_template.txt")
+    
+    mock_create.assert_called_once()
+    assert second == first
+    assert "cache_hit" not in first_metrics
+    assert second_metrics["cache_hit"] is True
+    assert second_metrics["total_tokens"] == 0
+
+def test_classify_issue_prompt_cache(llm_service):
+    """Test that identical prompts are memoized only for deterministic sampling."""
+    completion = _make_completion('```json\n{"classification": "need fixing", "explanation": "x"}\n```')
+    
+    with patch("openai.OpenAI") as mock_client, \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT):
+        mock_create = mock_client.return_value.chat.completions.create
+        mock_create.return_value = completion
+        llm_service.classify_issue(SAMPLE_ISSUE, "gpt4", "dummy_template.txt")
+        _, metrics = llm_service.classify_issue(SAMPLE_ISSUE, "gpt4", "dummy_template.txt")
+        assert mock_create.call_count == 1
+        assert metrics["cache_hit"] is True
+        
+        llm_service.llm_configs["gpt4"]["temperature"] = 0.7
+        llm_service.classify_issue(SAMPLE_ISSUE, "gpt4", "dummy_template.txt")
+        llm_service.classify_issue(SAMPLE_ISSUE, "gpt4", "dummy_template.txt")
+        assert mock_create.call_count == 3
+
+def test_classify_issues_batch_api(llm_service):
+    """Test that Batch API output lines are mapped back to their issues."""
+    completion_body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {
+                "role": "assistant",
+                "content": '```json\n{"classification": "very serious", "explanation": "x"}\n```'
+            }
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    }
+    output = "\n".join([
+        json.dumps({"custom_id": "1", "response": {"status_code": 500, "body": {"error": "boom"}}}),
+        json.dumps({"custom_id": "0", "response": {"status_code": 200, "body": completion_body}}),
+    ])
+    batch = MagicMock(id="batch_1", status="completed", input_file_id="file_in",
+                      output_file_id="file_out", error_file_id=None)
+    client = MagicMock()
+    client.batches.create.return_value = batch
+    client.batches.retrieve.return_value = batch
+    client.files.content.side_effect = lambda file_id: MagicMock(
+        text=uploaded_input[0] if file_id == "file_in" else output
+    )
+    uploaded_input = []
+    client.files.create.side_effect = lambda file, purpose: (
+        uploaded_input.append(file[1].decode("utf-8")) or MagicMock(id="file_in")
+    )
+    
+    with patch("openai.OpenAI", return_value=client), \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT):
+        results = llm_service.classify_issues_batch_api(
+            [SAMPLE_ISSUE, dict(SAMPLE_ISSUE, summary="Uninitialized variable: x")],
+            "gpt4",
+            "dummy_template.txt"
+        )
+    
+    uploaded = uploaded_input[0].splitlines()
+    assert [json.loads(line)["custom_id"] for line in uploaded] == ["0", "1"]
+    result, metrics = results[0]
+    assert result["classification"] == "very serious"
+    assert metrics["total_tokens"] == 15
+    assert SAMPLE_ISSUE["summary"] in metrics["full_prompt"]
+    assert isinstance(results[1], RuntimeError)
+
+def test_load_llm_configurations_cached(llm_service):
+    """Test that the config file is parsed once and re-read after it changes."""
+    with patch("yaml.load", wraps=yaml.load) as mock_load:
+        first = llm_service._load_llm_configurations()
+        first["gpt4"]["model"] = "modified"
+        second = llm_service._load_llm_configurations()
+        assert mock_load.call_count == 0
+        assert second["gpt4"]["model"] == "gpt-4"
+        
+        with open(llm_service.config_path, "a") as f:
+            f.write("  temperature: 0.5\n")
+        stat = os.stat(llm_service.config_path)
+        os.utime(llm_service.config_path, (stat.st_atime, stat.st_mtime + 1))
+        third = llm_service._load_llm_configurations()
+        assert mock_load.call_count == 1
+        assert third["gpt4"]["temperature"] == 0.5
+
+def test_compile_template_matches_format():
+    """Test that compiled templates render exactly like str.format."""
+    issue = dict(SAMPLE_ISSUE, summary="Braces {kept} verbatim")
+    assert _compile_template(SAMPLE_PROMPT)(issue) == SAMPLE_PROMPT.format(**issue)
+    assert _compile_template("{line:>5}|{id!r}")(issue) == "{line:>5}|{id!r}".format(**issue)
+    with pytest.raises(KeyError):
+        _compile_template("{missing}")(issue)
+
+def test_load_prompt_template_cached(llm_service, tmp_path):
+    """Test that template files are read once and re-read after they change."""
+    template = tmp_path / "template.txt"
+    template.write_text("first {summary}")
+    
+    assert llm_service.load_prompt_template(str(template)) == "first {summary}"
+    with patch("builtins.open", side_effect=AssertionError("template re-read")):
+        assert llm_service.load_prompt_template(str(template)) == "first {summary}"
+    
+    template.write_text("second {summary}")
+    stat = os.stat(template)
+    os.utime(template, (stat.st_atime, stat.st_mtime + 1))
+    assert llm_service.load_prompt_template(str(template)) == "second {summary}"
+
+@pytest.mark.parametrize("content", [
+    'Analysis:\n```JSON\n{"classification": "need fixing", "explanation": "x"}\n```',
+    '```\n{"classification": "need fixing", "explanation": "x"}\n```',
+    '{"classification": "need fixing", "explanation": "x"}',
+    '\n  {"classification": "need fixing", "explanation": "{x}"}\n',
+    'Braces like {this} in prose.\n```json\n{"classification": "need fixing", "explanation": "x"}\n```',
+])
+def test_parse_response_json_formats(llm_service, content):
+    """Test that fenced and bare JSON answers are both accepted."""
+    result, _ = llm_service._parse_response("prompt", _make_completion(content), 1, {})
+    assert result["classification"] == "need fixing"
+
+def test_parse_response_without_json(llm_service):
+    """Test that an answer without a JSON object is rejected."""
+    with pytest.raises(RuntimeError) as exc_info:
+        llm_service._parse_response("prompt", _make_completion("I am not sure."), 1, {})
+    assert "no JSON object" in str(exc_info.value)
+
+def test_openai_client_pooled(llm_service):
+    """Test that one OpenAI client is created and reused per endpoint and key."""
+    with patch("openai.OpenAI") as mock_client:
+        first = llm_service._get_client(llm_service.llm_configs["gpt4"])
+        second = llm_service._get_client(llm_service.llm_configs["gpt4"])
+        llm_service._get_client(dict(llm_service.llm_configs["gpt4"], base_url="http://localhost:8000/v1"))
+    assert first is second
+    assert mock_client.call_count == 2
+    assert mock_client.call_args_list[0][1]["api_key"] == "dummy_api_key_123"
+
+def test_prepare_prompt_fits_context_window(llm_service):
+    """Test that the code context is shortened to fit the configured context window."""
+    llm_service.llm_configs["gpt4"].update({"context_window": 600, "max_tokens": 100})
+    issue = dict(SAMPLE_ISSUE, code_context="x = 1;\n" * 2000)
+    
+    with patch("core.llm_service.tiktoken", None), \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT + "\n{code_context}"):
+        prompt, _ = llm_service._prepare_prompt(issue, "gpt4", "dummy_template.txt", 65536)
+    
+    assert prompt.endswith("... (truncated)")
+    assert llm_service.get_token_counts(prompt, "gpt-4")["estimated_tokens"] <= 500
+
+def test_build_request_prompt_cache_key(llm_service):
+    """Test that a configured prompt_cache_key is sent with the request."""
+    config = llm_service.llm_configs["gpt4"]
+    assert "prompt_cache_key" not in llm_service._build_request("p", llm_service._get_model_parameters(config))
+    
+    config["prompt_cache_key"] = "review-helper"
+    request = llm_service._build_request("p", llm_service._get_model_parameters(config))
+    assert request["prompt_cache_key"] == "review-helper"
+    assert request["messages"][-1] == {"role": "user", "content": "p"}
+
+def test_build_request_json_mode(llm_service):
+    """Test that json_mode requests a JSON object response format."""
+    config = llm_service.llm_configs["gpt4"]
+    assert "response_format" not in llm_service._build_request("p", llm_service._get_model_parameters(config))
+    
+    config["json_mode"] = True
+    request = llm_service._build_request("p", llm_service._get_model_parameters(config))
+    assert request["response_format"] == {"type": "json_object"}
+
+def test_get_token_counts_memoized(llm_service):
+    """Test that repeated token counts for the same text and model are memoized."""
+    text = "int *p = nullptr; *p = 1;" * 10
+    hits = _count_tokens.cache_info().hits
+    
+    first = llm_service.get_token_counts(text, "gpt-4")
+    second = llm_service.get_token_counts(text, "gpt-4")
+    
+    assert first == second
+    assert first["estimated_tokens"] > 0
+    assert _count_tokens.cache_info().hits == hits + 1
+
+@pytest.mark.parametrize("config", [
+    "broken:\n  model: gpt-4\n",
+    "broken:\n  provider: anthropic\n  model: claude\n",
+])
+def test_load_llm_configurations_invalid(tmp_path, config):
+    """Test that invalid LLM configurations are rejected when loaded."""
+    config_path = tmp_path / "models.yaml"
+    config_path.write_text(config)
+    with pytest.raises(ValueError) as exc_info:
+        LLMService(str(config_path))
+    assert "broken" in str(exc_info.value)
+
+def test_classify_issue_stream_stops_after_json(llm_service):
+    """Test that streaming stops reading once the classification object is complete."""
+    llm_service.llm_configs["gpt4"]["stream"] = True
+    deltas = ['```json\n{"classification": "need fixing",', ' "explanation": "x"}', '\n```', ' Trailing remarks.']
+    chunks = []
+    for delta in deltas:
+        chunk = MagicMock(usage=None)
+        chunk.choices[0].delta.content = delta
+        chunks.append(chunk)
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(chunks)
+    
+    with patch("openai.OpenAI") as mock_client, \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT):
+        mock_client.return_value.chat.completions.create.return_value = stream
+        result, metrics = llm_service.classify_issue(SAMPLE_ISSUE, "gpt4", "dummy_template.txt")
+    
+    assert result["classification"] == "need fixing"
+    assert "Trailing" not in metrics["full_response"]
+    assert metrics["completion_tokens"] > 0
+    stream.close.assert_called_once()
+
+def test_prepare_prompt_picks_up_edited_template(llm_service, tmp_path):
+    """Test that an edited template is used instead of the cached contents."""
+    template_path = tmp_path / "edited.txt"
+    template_path.write_text(SAMPLE_PROMPT)
+    with patch.object(llm_service, "_resolve_template_path", return_value=str(template_path)):
+        llm_service._prepare_prompt(SAMPLE_ISSUE, "gpt4", "edited.txt", 65536)
+        template_path.write_text("Edited: " + SAMPLE_PROMPT)
+        prompt, _ = llm_service._prepare_prompt(SAMPLE_ISSUE, "gpt4", "edited.txt", 65536)
+    assert prompt.startswith("Edited: ")
+
+def test_load_llm_configurations_resolves_api_key_env(tmp_path):
+    """Test that api_key_env is resolved into api_key when configurations are loaded."""
+    config_path = tmp_path / "models.yaml"
+    config_path.write_text("env_model:\n  provider: openai\n  model: gpt-4\n  api_key_env: TEST_LLM_API_KEY\n")
+    with patch.dict(os.environ, {"TEST_LLM_API_KEY": "env_key_456"}):
+        service = LLMService(str(config_path))
+    assert service.llm_configs["env_model"]["api_key"] == "env_key_456"
+    with patch.dict(os.environ, {}, clear=True):
+        assert service._get_api_key(service.llm_configs["env_model"]) == "env_key_456"
+
+def test_load_llm_configurations_detects_same_mtime_rewrite(llm_service):
+    """Test that a rewrite keeping the mtime but changing the size is picked up."""
+    stat = os.stat(llm_service.config_path)
+    with open(llm_service.config_path, "a") as f:
+        f.write("  max_tokens: 500\n")
+    os.utime(llm_service.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert llm_service._load_llm_configurations()["gpt4"]["max_tokens"] == 500
+
+def test_parse_response_bare_json_with_trailing_prose(llm_service):
+    """Test that a bare object is found despite braces in strings and trailing prose."""
+    content = '{"classification": "need fixing", "explanation": "check {ptr}"} Note: see } above.'
+    result, _ = llm_service._parse_response("prompt", _make_completion(content), 1, {})
+    assert result["explanation"] == "check {ptr}"
+
+def test_close_releases_pooled_clients(llm_service):
+    """Test that close() closes pooled clients so the next request creates a new one."""
+    with patch("openai.OpenAI") as mock_client:
+        llm_service._get_client(llm_service.llm_configs["gpt4"])
+        llm_service.close()
+        mock_client.return_value.close.assert_called_once()
+        llm_service._get_client(llm_service.llm_configs["gpt4"])
+    assert mock_client.call_count == 2
+
+def test_classify_batch_concurrency_limit(llm_service):
+    """Test that no more than `concurrency` requests are in flight at once."""
+    import asyncio
+    in_flight = 0
+    peak = 0
+    
+    async def create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _make_completion('{"classification": "need fixing", "explanation": "x"}')
+    
+    client = MagicMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+    client.chat.completions.create = create
+    issues = [dict(SAMPLE_ISSUE, summary=f"Issue {i}") for i in range(6)]
+    
+    with patch("openai.AsyncOpenAI", return_value=client), \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT):
+        results = llm_service.classify_batch(issues, "gpt4", "dummy_template.txt", concurrency=2)
+    
+    assert all(isinstance(result, tuple) for result in results)
+    assert peak == 2
+
+def test_classify_issues_loads_template_once(llm_service):
+    """Test that sequential batch classification loads the template once and keeps going after failures."""
+    completion = _make_completion('{"classification": "false positive", "explanation": "x"}')
+    issues = [SAMPLE_ISSUE, {"file": "a.cpp"}, dict(SAMPLE_ISSUE, summary="Other")]
+    
+    with patch("openai.OpenAI") as mock_client, \
+         patch.object(llm_service, "load_prompt_template", return_value=SAMPLE_PROMPT) as mock_load:
+        mock_client.return_value.chat.completions.create.return_value = completion
+        results = llm_service.classify_issues(issues, "gpt4", "dummy_template.txt")
+    
+    mock_load.assert_called_once()
+    assert results[0][0]["classification"] == "false positive"
+    assert isinstance(results[1], KeyError)
+    assert results[2][0]["classification"] == "false positive"
+
+@pytest.mark.parametrize("content", [
+    '{"classification": "need fixing"}',
+    '{"classification": ["need fixing"], "explanation": "x"}',
+    '["need fixing", "x"]',
+])
+def test_parse_response_rejects_invalid_structure(llm_service, content):
+    """Test that responses without a valid classification object are rejected."""
+    with pytest.raises(RuntimeError) as exc_info:
+        llm_service._parse_response("prompt", _make_completion(content), 1, {})
+    assert "Invalid" in str(exc_info.value)
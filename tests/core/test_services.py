@@ -0,0 +1,53 @@
+"""Tests for the services module."""
+
+import os
+import pytest
+from core.services import get_context_builder, get_llm_service, _create_llm_service
+
+SAMPLE_CONFIG = """
+gpt4:
+  provider: openai
+  model: gpt-4
+  api_key: dummy_api_key_123
+"""
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Write a sample LLM configuration and clear the shared services."""
+    path = tmp_path / "models.yaml"
+    path.write_text(SAMPLE_CONFIG)
+    _create_llm_service.clear()
+    yield str(path)
+    _create_llm_service.clear()
+
+def test_get_llm_service_reused(config_path):
+    """Test that the same service is returned while its sources are unchanged."""
+    service = get_llm_service(config_path)
+    assert get_llm_service(config_path) is service
+    assert service.llm_configs["gpt4"]["model"] == "gpt-4"
+
+def test_get_llm_service_recreated_on_config_change(config_path):
+    """Test that editing the configuration file yields a new service."""
+    service = get_llm_service(config_path)
+
+    with open(config_path, "a") as f:
+        f.write("  temperature: 0.5\n")
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    updated = get_llm_service(config_path)
+    assert updated is not service
+    assert updated.llm_configs["gpt4"]["temperature"] == 0.5
+
+def test_get_llm_service_missing_config(tmp_path):
+    """Test that a missing configuration file is reported, not cached."""
+    with pytest.raises(FileNotFoundError):
+        get_llm_service(str(tmp_path / "missing.yaml"))
+
+def test_get_context_builder_reused(tmp_path):
+    """Test that one context builder is shared per project root."""
+    get_context_builder.clear()
+    builder = get_context_builder(str(tmp_path))
+    assert get_context_builder(str(tmp_path)) is builder
+    assert get_context_builder(str(tmp_path / "other")) is not builder
+    get_context_builder.clear()